@@ -114,7 +114,9 @@ export default function EnhancedTutorInterface({
 
             ws.onmessage = (event) => {
                 const data = JSON.parse(event.data)
-                handleWebSocketMessage(data)
+                // The server coalesces queued frames into a single batch frame
+                const messages = data.type === 'batch' ? data.items : [data]
+                messages.forEach(handleWebSocketMessage)
             }
 
             ws.onclose = () => {
@@ -261,17 +263,8 @@ export default function EnhancedTutorInterface({
 
             mediaRecorderRef.current.ondataavailable = (event) => {
                 if (event.data.size > 0 && wsConnection) {
-                    // Convert to base64 and send
-                    const reader = new FileReader()
-                    reader.onload = () => {
-                        const base64Audio = (reader.result as string).split(',')[1]
-                        wsConnection.send(JSON.stringify({
-                            type: 'audio_message',
-                            audio_data: base64Audio,
-                            format: 'wav'
-                        }))
-                    }
-                    reader.readAsDataURL(event.data)
+                    // Binary frames are treated as audio chunks; no base64 round trip
+                    wsConnection.send(event.data)
                 }
             }
 
@@ -59,8 +59,11 @@ export function useWebSocket({
 
       ws.onmessage = (event) => {
         try {
-          const message: WebSocketMessage = JSON.parse(event.data);
-          onMessage?.(message);
+          const message = JSON.parse(event.data);
+          // The server coalesces queued frames into a single batch frame
+          const messages: WebSocketMessage[] =
+            message.type === 'batch' ? message.items : [message];
+          messages.forEach((item) => onMessage?.(item));
         } catch (error) {
           console.error('Failed to parse WebSocket message:', error);
         }
@@ -2,14 +2,14 @@
 """Debug script to start all IELTS platform services in debug mode."""
 
 import asyncio
-import subprocess
 import sys
 import os
 import signal
-import time
-from typing import List, Dict
+from typing import IO, Dict, Tuple
 import logging
 
+import httpx
+
 # Setup logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -21,7 +21,11 @@ class ServiceManager:
     """Manages multiple services in debug mode."""
     
     def __init__(self):
-        self.processes: Dict[str, subprocess.Popen] = {}
+        self.processes: Dict[str, asyncio.subprocess.Process] = {}
+        # One task per child awaiting its exit, named after the service
+        self._exit_waiters: Dict[str, asyncio.Task] = {}
+        self.log_dir = os.path.abspath('logs')
+        self._log_handles: Dict[str, Tuple[IO[bytes], IO[bytes]]] = {}
         self.services = {
             'api': {
                 'command': ['python', 'main.py'],
@@ -55,7 +59,7 @@ class ServiceManager:
             }
         }
     
-    def start_service(self, service_name: str) -> bool:
+    async def start_service(self, service_name: str) -> bool:
         """Start a single service in debug mode."""
         if service_name not in self.services:
             logger.error(f"Unknown service: {service_name}")
@@ -68,118 +72,180 @@ class ServiceManager:
         env.update(service_config['env'])
         env['PYTHONPATH'] = os.path.abspath('.')
         
+        # Write output straight to files; an undrained PIPE blocks the child
+        # once the OS pipe buffer fills up.
+        os.makedirs(self.log_dir, exist_ok=True)
+        stdout_path, stderr_path = self.get_log_paths(service_name)
+        stdout_f = open(stdout_path, 'ab', buffering=0)
+        stderr_f = open(stderr_path, 'ab', buffering=0)
+        
         try:
             logger.info(f"Starting {service_name} service...")
-            process = subprocess.Popen(
-                service_config['command'],
+            process = await asyncio.create_subprocess_exec(
+                *service_config['command'],
                 cwd=service_config['cwd'],
                 env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                stdout=stdout_f,
+                stderr=stderr_f
             )
             
             self.processes[service_name] = process
+            self._log_handles[service_name] = (stdout_f, stderr_f)
+            self._exit_waiters[service_name] = asyncio.create_task(
+                process.wait(), name=service_name
+            )
             logger.info(f"Started {service_name} service (PID: {process.pid})")
             return True
             
         except Exception as e:
+            stdout_f.close()
+            stderr_f.close()
             logger.error(f"Failed to start {service_name} service: {e}")
             return False
     
-    def start_all_services(self) -> bool:
+    def get_log_paths(self, service_name: str) -> Tuple[str, str]:
+        """Get the stdout and stderr log file paths for a service."""
+        return (
+            os.path.join(self.log_dir, f"{service_name}.stdout.log"),
+            os.path.join(self.log_dir, f"{service_name}.stderr.log"),
+        )
+    
+    async def wait_for_service(self, service_name: str, client: httpx.AsyncClient,
+                               timeout: float = 15.0, interval: float = 0.1) -> bool:
+        """Poll a service's /health endpoint until it answers 200 or the timeout expires."""
+        url = f"http://localhost:{self.services[service_name]['port']}/health"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        
+        while loop.time() < deadline:
+            process = self.processes.get(service_name)
+            if process is None or process.returncode is not None:
+                logger.error(f"{service_name} service exited during startup")
+                return False
+            try:
+                response = await client.get(url, timeout=interval * 5)
+                if response.status_code == 200:
+                    logger.info(f"{service_name} service is ready")
+                    return True
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(interval)
+        
+        logger.warning(f"{service_name} service not ready after {timeout:.0f}s")
+        return False
+    
+    async def start_all_services(self) -> bool:
         """Start all services in debug mode."""
         logger.info("Starting all IELTS platform services in debug mode...")
         
-        success_count = 0
-        for service_name in self.services:
-            if self.start_service(service_name):
-                success_count += 1
-                time.sleep(2)  # Give each service time to start
+        started = await asyncio.gather(*[self.start_service(name) for name in self.services])
+        started_names = [name for name, ok in zip(self.services, started) if ok]
         
-        logger.info(f"Started {success_count}/{len(self.services)} services")
+        # Wait for readiness instead of sleeping a fixed interval per service
+        async with httpx.AsyncClient() as client:
+            ready = await asyncio.gather(
+                *[self.wait_for_service(name, client) for name in started_names]
+            )
+        
+        success_count = len(started_names)
+        logger.info(f"Started {success_count}/{len(self.services)} services "
+                    f"({sum(ready)} ready)")
         return success_count == len(self.services)
     
-    def stop_service(self, service_name: str):
+    async def stop_service(self, service_name: str):
         """Stop a single service."""
+        waiter = self._exit_waiters.pop(service_name, None)
+        
         if service_name in self.processes:
             process = self.processes[service_name]
             logger.info(f"Stopping {service_name} service (PID: {process.pid})...")
             
             try:
-                process.terminate()
-                process.wait(timeout=10)
+                if process.returncode is None:
+                    process.terminate()
+                    await asyncio.wait_for(process.wait(), timeout=10)
                 logger.info(f"Stopped {service_name} service")
-            except subprocess.TimeoutExpired:
+            except asyncio.TimeoutError:
                 logger.warning(f"Force killing {service_name} service")
                 process.kill()
+                await process.wait()
+            except ProcessLookupError:
+                pass  # Exited between the returncode check and terminate()
             except Exception as e:
                 logger.error(f"Error stopping {service_name} service: {e}")
             
             del self.processes[service_name]
+        
+        if waiter is not None and not waiter.done():
+            waiter.cancel()
+        
+        for handle in self._log_handles.pop(service_name, ()):
+            handle.close()
     
-    def stop_all_services(self):
+    async def stop_all_services(self):
         """Stop all services."""
         logger.info("Stopping all services...")
-        for service_name in list(self.processes.keys()):
-            self.stop_service(service_name)
+        await asyncio.gather(*[self.stop_service(name) for name in list(self.processes)])
     
     def get_service_status(self) -> Dict[str, str]:
         """Get status of all services."""
         status = {}
         for service_name, process in self.processes.items():
-            if process.poll() is None:
+            if process.returncode is None:
                 status[service_name] = "running"
             else:
                 status[service_name] = f"stopped (exit code: {process.returncode})"
         return status
     
-    def monitor_services(self):
-        """Monitor running services and restart if needed."""
+    async def monitor_services(self):
+        """Monitor running services and restart any that exit.
+        
+        Sleeps until a child process exits rather than polling, so a crash is
+        picked up immediately.
+        """
         logger.info("Monitoring services...")
-        try:
-            while True:
-                for service_name, process in self.processes.items():
-                    if process.poll() is not None:
-                        logger.warning(f"{service_name} service stopped unexpectedly")
-                        # Restart the service
-                        self.stop_service(service_name)
-                        time.sleep(1)
-                        self.start_service(service_name)
-                
-                time.sleep(5)  # Check every 5 seconds
-                
-        except KeyboardInterrupt:
-            logger.info("Monitoring stopped by user")
+        while self._exit_waiters:
+            done, _ = await asyncio.wait(
+                self._exit_waiters.values(), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                service_name = task.get_name()
+                if self._exit_waiters.get(service_name) is not task:
+                    continue
+                logger.warning(f"{service_name} service stopped unexpectedly "
+                               f"(exit code: {task.result()})")
+                # Restart the service
+                await self.stop_service(service_name)
+                await asyncio.sleep(1)
+                await self.start_service(service_name)
     
     def print_logs(self):
-        """Print logs from all services."""
-        logger.info("Service logs:")
-        for service_name, process in self.processes.items():
-            if process.stdout:
-                logger.info(f"\n=== {service_name.upper()} LOGS ===")
-                for line in process.stdout:
-                    print(f"[{service_name}] {line.strip()}")
+        """Print where each service writes its logs."""
+        logger.info("Service logs (follow with `tail -f <path>`):")
+        for service_name in self.processes:
+            for path in self.get_log_paths(service_name):
+                logger.info(f"  [{service_name}] {path}")
 
 
-def main():
-    """Main function to run the debug environment."""
-    manager = ServiceManager()
+async def run(manager: ServiceManager) -> int:
+    """Start the services and supervise them until a shutdown signal arrives."""
+    loop = asyncio.get_running_loop()
+    shutdown = asyncio.Event()
     
-    def signal_handler(signum, frame):
+    def signal_handler():
         logger.info("Received shutdown signal")
-        manager.stop_all_services()
-        sys.exit(0)
+        shutdown.set()
     
     # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, signal_handler)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C surfaces as KeyboardInterrupt instead
     
     try:
         # Start all services
-        if not manager.start_all_services():
+        if not await manager.start_all_services():
             logger.error("Failed to start all services")
             return 1
         
@@ -201,18 +267,33 @@ def main():
         logger.info("\nDebug endpoints:")
         logger.info("  - API Debug Stats: http://localhost:8000/debug/stats")
         logger.info("  - API Docs: http://localhost:8000/docs")
+        manager.print_logs()
         logger.info("\nPress Ctrl+C to stop all services")
         logger.info("="*50)
         
-        # Monitor services
-        manager.monitor_services()
+        # Monitor services until shutdown
+        monitor = asyncio.create_task(manager.monitor_services())
+        stop = asyncio.create_task(shutdown.wait())
+        await asyncio.wait({monitor, stop}, return_when=asyncio.FIRST_COMPLETED)
+        for task in (monitor, stop):
+            task.cancel()
+        return 0
         
-    except KeyboardInterrupt:
-        logger.info("Shutting down debug environment...")
     finally:
-        manager.stop_all_services()
+        await manager.stop_all_services()
         logger.info("Debug environment stopped")
 
 
+def main():
+    """Main function to run the debug environment."""
+    manager = ServiceManager()
+    
+    try:
+        return asyncio.run(run(manager))
+    except KeyboardInterrupt:
+        logger.info("Shutting down debug environment...")
+        return 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,20 @@
+import math
+
+import numpy as np
+from numba import njit
+
+# Maps the RMS of 16-bit PCM samples onto the 0-100 audio level scale
+AUDIO_LEVEL_SCALE = 100.0 / 32768.0
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def rms_level(samples: np.ndarray) -> float:
+    """Loudness of int16 PCM samples on a 0-100 scale, in one pass with no temporaries"""
+    n = samples.shape[0]
+    if n == 0:
+        return 0.0
+    total = 0.0
+    for i in range(n):
+        v = float(samples[i])
+        total += v * v
+    return min(100.0, math.sqrt(total / n) * AUDIO_LEVEL_SCALE)
@@ -1,11 +1,30 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Dict, List, Optional, Any
+from fastapi.responses import ORJSONResponse
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import hashlib
+import orjson
 import structlog
+import time
 from datetime import datetime
+from pydantic import TypeAdapter
+from celery.result import AsyncResult
+from redis.asyncio import Redis
+
+from config import settings
 
 from services.tutor_service import TutorService
-from services.recommendation_service import RecommendationService
+from services.recommendation_service import RecommendationService, is_complete_daily
 from services.learning_path_service import LearningPathService
+from models.learning_path import AdaptiveContent
+from api.schemas import ChatRequest, FeedbackRequest, LearningPathRequest
+from tasks import (
+    ACTIVE_USERS_KEY,
+    DAILY_RECOMMENDATIONS_TTL,
+    celery_app,
+    daily_recommendations_key,
+    generate_learning_path_task
+)
 
 logger = structlog.get_logger()
 
@@ -15,6 +34,21 @@ router = APIRouter()
 tutor_service: Optional[TutorService] = None
 recommendation_service: Optional[RecommendationService] = None
 learning_path_service: Optional[LearningPathService] = None
+redis_client: Optional[Redis] = None
+
+# Bump to invalidate every cached response after a payload format change
+CACHE_VERSION = "v1"
+# Browser-side freshness for cached per-user GET responses (seconds)
+CLIENT_CACHE_MAX_AGE = 60
+_CLIENT_CACHE_HEADERS = {"Cache-Control": f"private, max-age={CLIENT_CACHE_MAX_AGE}"}
+# Window in which an identical chat submission reuses the first response (seconds)
+CHAT_DEDUP_TTL = 60
+# Longest a duplicate waits on the first submission's in-flight marker (seconds)
+IN_FLIGHT_TTL = 30
+IN_FLIGHT_POLL_INTERVAL = 0.1
+
+# Dumps a whole content list in one pydantic-core call
+_adaptive_content_adapter = TypeAdapter(List[AdaptiveContent])
 
 def get_tutor_service() -> TutorService:
     if tutor_service is None:
@@ -31,18 +65,127 @@ def get_learning_path_service() -> LearningPathService:
         raise HTTPException(status_code=503, detail="Learning path service not available")
     return learning_path_service
 
+def _chat_cache_key(user_id: str, message: str, context: Optional[Dict[str, Any]]) -> str:
+    # Not security sensitive; blake2b is just a fast, short digest
+    digest = hashlib.blake2b(
+        orjson.dumps([user_id, message, context], option=orjson.OPT_SORT_KEYS),
+        digest_size=16
+    ).hexdigest()
+    return f"{CACHE_VERSION}:chat:{digest}"
+
+def _recommendation_cache_key(user_id: str, endpoint: str, *parts: Any) -> str:
+    return ":".join([CACHE_VERSION, "rec", "user", user_id, endpoint, *map(str, parts)])
+
+def _is_real_result(value: Any) -> bool:
+    """False for the fallback payloads services return instead of raising"""
+    return not (isinstance(value, dict) and value.get("fallback"))
+
+def _is_complete_list(items: Any) -> bool:
+    """False for an empty result or one holding any fallback entry"""
+    return bool(items) and all(map(_is_real_result, items))
+
+async def _cache_aside(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: Optional[int] = None,
+    cacheable: Callable[[Any], bool] = _is_real_result,
+    single_flight: bool = False
+) -> Any:
+    """Return the cached value for key, or load and cache it.
+    
+    Only values that pass cacheable are stored, and only if no other request
+    stored one first. With single_flight, concurrent misses wait for the first
+    request's result instead of running the loader again. Redis errors are
+    logged and fall through to the loader so the cache can never take an
+    endpoint down.
+    """
+    if redis_client is None:
+        return await loader()
+    
+    try:
+        cached = await redis_client.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+    except Exception as e:
+        logger.warning("Response cache read failed", key=key, error=str(e))
+    
+    lock_key = f"{key}:in-flight"
+    owns_lock = False
+    if single_flight:
+        try:
+            owns_lock = bool(await redis_client.set(lock_key, b"1", nx=True, ex=IN_FLIGHT_TTL))
+            if not owns_lock:
+                cached = await _wait_in_flight(key, lock_key)
+                if cached is not None:
+                    return orjson.loads(cached)
+        except Exception as e:
+            logger.warning("Response cache in-flight check failed", key=key, error=str(e))
+    
+    try:
+        value = await loader()
+        if cacheable(value):
+            try:
+                await redis_client.set(key, orjson.dumps(value), ex=ttl or settings.response_cache_ttl, nx=True)
+            except Exception as e:
+                logger.warning("Response cache write failed", key=key, error=str(e))
+        return value
+    finally:
+        if owns_lock:
+            try:
+                await redis_client.delete(lock_key)
+            except Exception as e:
+                logger.warning("Response cache in-flight release failed", key=key, error=str(e))
+
+async def _wait_in_flight(key: str, lock_key: str) -> Optional[bytes]:
+    """Poll for the value another request is loading; None once its marker is gone without one"""
+    for _ in range(int(IN_FLIGHT_TTL / IN_FLIGHT_POLL_INTERVAL)):
+        await asyncio.sleep(IN_FLIGHT_POLL_INTERVAL)
+        cached, in_flight = await redis_client.pipeline(transaction=False).get(key).exists(lock_key).execute()
+        if cached is not None:
+            return cached
+        if not in_flight:
+            return None
+    return None
+
+async def _mark_active(user_id: str):
+    """Keep a user in the nightly daily-recommendations precompute"""
+    if redis_client is None:
+        return
+    
+    try:
+        await redis_client.zadd(ACTIVE_USERS_KEY, {user_id: time.time()})
+    except Exception as e:
+        logger.warning("Failed to record active user", user_id=user_id, error=str(e))
+
+async def _invalidate_recommendations(user_id: str):
+    """Drop every cached recommendation response for a user"""
+    if redis_client is None:
+        return
+    
+    try:
+        keys = [key async for key in redis_client.scan_iter(match=_recommendation_cache_key(user_id, "*"))]
+        if keys:
+            await redis_client.delete(*keys)
+    except Exception as e:
+        logger.warning("Response cache invalidation failed", user_id=user_id, error=str(e))
+
 @router.post("/chat")
 async def chat_with_tutor(
-    user_id: str,
-    message: str,
-    context: Optional[Dict[str, Any]] = None,
+    req: ChatRequest,
     tutor_service: TutorService = Depends(get_tutor_service)
 ) -> Dict[str, Any]:
     """Chat with AI tutor"""
+    user_id, message, context = req.user_id, req.message, req.context
     try:
         logger.info("Chat request received", user_id=user_id, message_length=len(message))
         
-        response = await tutor_service.chat(user_id, message, context)
+        # Double submits and client retries reuse the first response
+        response = await _cache_aside(
+            _chat_cache_key(user_id, message, context),
+            lambda: tutor_service.chat(user_id, message, context),
+            ttl=CHAT_DEDUP_TTL,
+            single_flight=True
+        )
         
         return {
             "success": True,
@@ -55,12 +198,11 @@ async def chat_with_tutor(
 
 @router.post("/feedback")
 async def get_personalized_feedback(
-    user_id: str,
-    module: str,
-    performance_data: Dict[str, Any],
+    req: FeedbackRequest,
     tutor_service: TutorService = Depends(get_tutor_service)
 ) -> Dict[str, Any]:
     """Get personalized feedback based on performance"""
+    user_id, module, performance_data = req.user_id, req.module, req.performance_data
     try:
         logger.info("Feedback request received", user_id=user_id, module=module)
         
@@ -81,17 +223,21 @@ async def get_recommendations(
     module: Optional[str] = Query(None, description="Specific module to get recommendations for"),
     limit: int = Query(5, ge=1, le=20, description="Number of recommendations to return"),
     recommendation_service: RecommendationService = Depends(get_recommendation_service)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Get personalized recommendations"""
     try:
         logger.info("Recommendations request received", user_id=user_id, module=module, limit=limit)
         
-        recommendations = await recommendation_service.get_recommendations(user_id, module, limit)
+        recommendations = await _cache_aside(
+            _recommendation_cache_key(user_id, "recommendations", module, limit),
+            lambda: recommendation_service.get_recommendations(user_id, module, limit),
+            cacheable=_is_complete_list
+        )
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": recommendations
-        }
+        }, headers=_CLIENT_CACHE_HEADERS)
         
     except Exception as e:
         logger.error("Error in recommendations endpoint", user_id=user_id, error=str(e))
@@ -101,17 +247,25 @@ async def get_recommendations(
 async def get_daily_recommendations(
     user_id: str,
     recommendation_service: RecommendationService = Depends(get_recommendation_service)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Get daily personalized recommendations"""
     try:
         logger.info("Daily recommendations request received", user_id=user_id)
         
-        daily_recommendations = await recommendation_service.get_daily_recommendations(user_id)
+        # Precomputed nightly by the worker; a miss is computed here and backfilled
+        # unless it fell back, so a transient failure is not served all day
+        await _mark_active(user_id)
+        daily_recommendations = await _cache_aside(
+            daily_recommendations_key(user_id),
+            lambda: recommendation_service.get_daily_recommendations(user_id),
+            ttl=DAILY_RECOMMENDATIONS_TTL,
+            cacheable=is_complete_daily
+        )
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": daily_recommendations
-        }
+        }, headers=_CLIENT_CACHE_HEADERS)
         
     except Exception as e:
         logger.error("Error in daily recommendations endpoint", user_id=user_id, error=str(e))
@@ -132,35 +286,54 @@ async def get_adaptive_content(
         
         return {
             "success": True,
-            "data": [content.dict() for content in adaptive_content]
+            "data": _adaptive_content_adapter.dump_python(adaptive_content, mode="json")
         }
         
     except Exception as e:
         logger.error("Error in adaptive content endpoint", user_id=user_id, error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get adaptive content")
 
-@router.post("/learning-paths/generate")
-async def generate_learning_path(
-    user_id: str,
-    target_score: float,
-    timeframe: str = "30",
-    learning_path_service: LearningPathService = Depends(get_learning_path_service)
-) -> Dict[str, Any]:
-    """Generate personalized learning path"""
+@router.post("/learning-paths/generate", status_code=202)
+def generate_learning_path(req: LearningPathRequest) -> Dict[str, Any]:
+    """Queue personalized learning path generation
+    
+    The path is pushed over the user's WebSocket when ready and can also be
+    polled from /learning-paths/generate/{task_id}. A plain def, so the
+    broker publish runs in the threadpool instead of on the event loop.
+    """
+    user_id, target_score, timeframe = req.user_id, req.target_score, req.timeframe
     try:
         logger.info("Learning path generation request received", user_id=user_id, target_score=target_score, timeframe=timeframe)
         
-        learning_path = await learning_path_service.generate_path(user_id, target_score, timeframe)
+        task = generate_learning_path_task.delay(user_id, target_score, timeframe)
         
         return {
             "success": True,
-            "data": learning_path
+            "data": {"task_id": task.id}
         }
         
     except Exception as e:
         logger.error("Error in learning path generation endpoint", user_id=user_id, error=str(e))
         raise HTTPException(status_code=500, detail="Failed to generate learning path")
 
+@router.get("/learning-paths/generate/{task_id}")
+def get_learning_path_task(task_id: str) -> Dict[str, Any]:
+    """Poll a queued learning path generation"""
+    result = AsyncResult(task_id, app=celery_app)
+    
+    if result.failed():
+        logger.error("Learning path task failed", task_id=task_id, error=str(result.result))
+        raise HTTPException(status_code=500, detail="Failed to generate learning path")
+    
+    return {
+        "success": True,
+        "data": {
+            "task_id": task_id,
+            "status": result.state,
+            "learning_path": result.result if result.successful() else None
+        }
+    }
+
 @router.put("/learning-paths/{path_id}/progress")
 async def update_path_progress(
     path_id: str,
@@ -173,6 +346,7 @@ async def update_path_progress(
         logger.info("Path progress update request received", user_id=user_id, path_id=path_id, step_id=completed_step_id)
         
         updated_path = await learning_path_service.update_path_progress(user_id, path_id, completed_step_id)
+        await _invalidate_recommendations(user_id)
         
         return {
             "success": True,
@@ -187,17 +361,21 @@ async def update_path_progress(
 async def get_path_recommendations(
     user_id: str,
     learning_path_service: LearningPathService = Depends(get_learning_path_service)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """Get recommended learning paths"""
     try:
         logger.info("Path recommendations request received", user_id=user_id)
         
-        path_recommendations = await learning_path_service.get_path_recommendations(user_id)
+        path_recommendations = await _cache_aside(
+            _recommendation_cache_key(user_id, "learning-paths"),
+            lambda: learning_path_service.get_path_recommendations(user_id),
+            cacheable=_is_complete_list
+        )
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": path_recommendations
-        }
+        }, headers=_CLIENT_CACHE_HEADERS)
         
     except Exception as e:
         logger.error("Error in path recommendations endpoint", user_id=user_id, error=str(e))
@@ -219,7 +397,7 @@ async def start_tutoring_session(
             "data": {
                 "session_id": session_id,
                 "user_id": user_id,
-                "start_time": datetime.utcnow().isoformat()
+                "start_time": datetime.utcnow()
             }
         }
         
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Dict, Optional, Any
+
+class ChatRequest(BaseModel):
+    """Request body for chatting with the tutor"""
+    user_id: str
+    message: str
+    context: Optional[Dict[str, Any]] = None
+
+class FeedbackRequest(BaseModel):
+    """Request body for personalized feedback"""
+    user_id: str
+    module: str
+    performance_data: Dict[str, Any]
+
+class LearningPathRequest(BaseModel):
+    """Request body for generating a learning path"""
+    user_id: str
+    target_score: float
+    timeframe: str = "30"
@@ -1,31 +1,189 @@
 from fastapi import WebSocket
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, field
+from pydantic import BaseModel
+import logging
 import structlog
-import json
+import orjson
 import asyncio
-import base64
+import pybase64
 import io
-from datetime import datetime
+import time
 import numpy as np
 
+from api.audio_level import rms_level
+from timestamps import iso_utc, iso_utc_now
+
 logger = structlog.get_logger()
+# Level check for per-message debug logs, so their kwargs are never built when disabled
+_log_level = logging.getLogger(__name__)
+
+
+def _encode(message: dict) -> str:
+    """Serialize a message for a WebSocket text frame.
+
+    orjson handles datetimes and numpy values natively; naive datetimes are
+    utcnow() values, so they are marked as UTC. Frames stay text because
+    clients parse them with JSON.parse.
+    """
+    return orjson.dumps(message, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+# Outbound frames buffered per connection before new ones are dropped
+SEND_QUEUE_SIZE = 256
+# Queue depth at which a client is treated as slow and snapshot frames are shed
+SEND_QUEUE_HIGH_WATER = 128
+# A failed send is retried once after this delay before disconnecting (seconds)
+SEND_ATTEMPTS = 2
+SEND_RETRY_DELAY = 0.05
+
+# Longest recording kept per user: 2 minutes of 16 kHz mono 16-bit PCM (bytes)
+MAX_AUDIO_BUFFER_BYTES = 16000 * 2 * 120
+
+# Repeated voice_start/voice_stop within this window are dropped (nanoseconds)
+VOICE_CONTROL_DEBOUNCE_NS = 50_000_000
+
+# Snapshot-style frames where only the newest one queued matters
+COALESCED_TYPES = frozenset({"audio_level", "progress_insight", "typing_indicator"})
+# How long the writer waits for more frames after a coalescable one (seconds)
+COALESCE_WINDOW = 0.02
+
+
+def _coalesce(frames: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Drop all but the last frame of each coalescable type, preserving order"""
+    last_index = {
+        message_type: i
+        for i, (message_type, _) in enumerate(frames)
+        if message_type in COALESCED_TYPES
+    }
+    return [
+        frame
+        for i, frame in enumerate(frames)
+        if frame[0] not in COALESCED_TYPES or last_index[frame[0]] == i
+    ]
+
+
+# connection_established frame split around the per-connection fields, so
+# connect only has to serialize the user id and timestamp
+_WELCOME_PARTS = tuple(
+    _encode({
+        "type": "connection_established",
+        "data": {
+            "message": "Connected to Enhanced AI Tutor",
+            "user_id": "__USER_ID__",
+            "capabilities": [
+                "text_chat",
+                "voice_interaction",
+                "speech_analysis",
+                "multi_modal_responses",
+                "real_time_feedback",
+                "adaptive_learning",
+                "progress_tracking"
+            ],
+            "timestamp": "__TIMESTAMP__"
+        }
+    }).replace('"__TIMESTAMP__"', '"__USER_ID__"').split('"__USER_ID__"')
+)
+
+
+def _welcome_frame(user_id: str, timestamp: str) -> str:
+    head, middle, tail = _WELCOME_PARTS
+    return head + orjson.dumps(user_id).decode() + middle + orjson.dumps(timestamp).decode() + tail
+
+
+def _stamped_template(message_type: str, data: dict) -> Tuple[str, str]:
+    """Pre-serialize a fixed message as (type, envelope up to its timestamp value)"""
+    frame = _encode({"type": message_type, "data": data, "timestamp": ""})
+    return message_type, frame[:-2]  # drop the closing '"}'
+
+
+_VOICE_STARTED = _stamped_template("voice_started", {"message": "Voice recording started"})
+_VOICE_PROCESSING = _stamped_template("voice_processing", {"message": "Processing voice input..."})
+
+
+@dataclass(slots=True)
+class UserState:
+    """Everything the manager tracks for one connected user"""
+    websocket: WebSocket
+    queue: asyncio.Queue  # outbound (message_type, payload) frames
+    context: Dict[str, Any]
+    writer: Optional[asyncio.Task] = None
+    session_id: Optional[str] = None
+    audio_buffer: bytearray = field(default_factory=bytearray)  # recorded PCM
+    speech_analyzer: Any = None
+    is_typing: bool = False
+    is_slow: bool = False  # already told it is falling behind
+    session_info: Optional[Dict[str, Any]] = None  # cached get_session_info result
+    voice_control_ns: Dict[str, int] = field(default_factory=dict)  # type -> last monotonic_ns
+
 
 class EnhancedWebSocketManager:
     """Enhanced WebSocket manager for multi-modal AI tutoring"""
     
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-        self.user_sessions: Dict[str, str] = {}  # user_id -> session_id
-        self.user_contexts: Dict[str, Dict[str, Any]] = {}  # user_id -> context
-        self.audio_buffers: Dict[str, List[bytes]] = {}  # user_id -> audio_chunks
-        self.speech_analyzers: Dict[str, Any] = {}  # user_id -> speech_analyzer
-        self.typing_indicators: Dict[str, bool] = {}  # user_id -> is_typing
+        self.users: Dict[str, UserState] = {}
+        # Immutable (user_id, queue) view for fan-out, rebuilt only when connections change
+        self._recipients: Tuple[Tuple[str, asyncio.Queue], ...] = ()
+        # Inbound message type -> handler(user_id, message)
+        self._handlers = {
+            "ping": self.handle_ping,
+            "user_message": self.handle_text_message,
+            "audio_message": self.handle_audio_message,
+            "voice_start": self.handle_voice_start,
+            "voice_stop": self.handle_voice_stop,
+            "typing_start": self.handle_typing_start,
+            "typing_stop": self.handle_typing_stop,
+            "personality_update": self.handle_personality_update,
+            "session_start": self.handle_session_start,
+            "session_end": self.handle_session_end,
+            "get_recommendations": self.handle_recommendation_request,
+            "get_learning_path": self.handle_learning_path_request
+        }
         
-    async def connect(self, websocket: WebSocket, user_id: str):
-        """Connect a new WebSocket client"""
+    async def connect(self, websocket: WebSocket, user_id: str) -> UserState:
+        """Connect a new WebSocket client, replacing any earlier connection for the user
+        
+        Returns the connection's state; pass it back to disconnect().
+        """
         await websocket.accept()
-        self.active_connections[user_id] = websocket
-        self.user_contexts[user_id] = {
+        now = time.time()  # One clock read for the whole handshake
+        state = UserState(
+            websocket=websocket,
+            queue=asyncio.Queue(maxsize=SEND_QUEUE_SIZE),
+            context=self._new_context(now)
+        )
+        state.writer = asyncio.create_task(self._writer(user_id, state))
+        previous = self.users.get(user_id)
+        self.users[user_id] = state
+        self._refresh_recipients()
+        
+        if previous is not None:
+            # Stop the old writer and end the old socket; its endpoint then exits
+            # through disconnect(), which leaves this connection's state alone
+            self._cancel_writer(previous)
+            try:
+                await previous.websocket.close()
+            except Exception as e:
+                logger.debug("Replaced WebSocket already closed", user_id=user_id, error=str(e))
+            logger.info("Replaced existing WebSocket connection", user_id=user_id)
+        
+        logger.info("Enhanced WebSocket connected", user_id=user_id)
+        
+        # Send welcome message with enhanced capabilities
+        self._enqueue(user_id, state.queue, (
+            "connection_established",
+            _welcome_frame(user_id, iso_utc(now))
+        ))
+        return state
+    
+    @staticmethod
+    def _new_context(now: float) -> Dict[str, Any]:
+        """Initial tutoring context for a new connection
+        
+        session_start and last_activity are epoch seconds; they are only
+        formatted when the context leaves the manager.
+        """
+        return {
             "personality": {
                 "teaching_style": "conversational",
                 "interaction_mode": "multi-modal",
@@ -33,211 +191,290 @@ class EnhancedWebSocketManager:
                 "feedback_style": "constructive",
                 "pace": "moderate"
             },
-            "session_start": datetime.utcnow(),
+            "session_start": now,
             "message_count": 0,
-            "last_activity": datetime.utcnow(),
+            "last_activity": now,
             "preferences": {},
             "learning_goals": []
         }
-        self.audio_buffers[user_id] = []
-        self.typing_indicators[user_id] = False
-        
-        logger.info("Enhanced WebSocket connected", user_id=user_id)
-        
-        # Send welcome message with enhanced capabilities
-        await self.send_message(user_id, {
-            "type": "connection_established",
-            "data": {
-                "message": "Connected to Enhanced AI Tutor",
-                "user_id": user_id,
-                "capabilities": [
-                    "text_chat",
-                    "voice_interaction", 
-                    "speech_analysis",
-                    "multi_modal_responses",
-                    "real_time_feedback",
-                    "adaptive_learning",
-                    "progress_tracking"
-                ],
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        })
     
-    def disconnect(self, user_id: str):
-        """Disconnect a WebSocket client"""
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
+    @staticmethod
+    def _format_context(context: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a context with its epoch timestamps rendered as ISO 8601"""
+        if "session_start" not in context:
+            return context
+        return {
+            **context,
+            "session_start": iso_utc(context["session_start"]),
+            "last_activity": iso_utc(context["last_activity"])
+        }
+    
+    def disconnect(self, user_id: str, state: Optional[UserState] = None):
+        """Disconnect a WebSocket client
         
-        if user_id in self.user_sessions:
-            del self.user_sessions[user_id]
-            
-        if user_id in self.user_contexts:
-            del self.user_contexts[user_id]
-            
-        if user_id in self.audio_buffers:
-            del self.audio_buffers[user_id]
-            
-        if user_id in self.speech_analyzers:
-            del self.speech_analyzers[user_id]
-            
-        if user_id in self.typing_indicators:
-            del self.typing_indicators[user_id]
+        With a state, only that connection is removed; a newer connection for
+        the same user stays registered.
+        """
+        current = self.users.get(user_id)
+        if state is None:
+            state = current
+        if state is not None and state is current:
+            del self.users[user_id]
+            self._refresh_recipients()
+        
+        if state is not None:
+            self._cancel_writer(state)
         
         logger.info("Enhanced WebSocket disconnected", user_id=user_id)
     
+    @staticmethod
+    def _cancel_writer(state: UserState):
+        """Cancel a connection's writer task unless it is the caller"""
+        if state.writer is not None and state.writer is not asyncio.current_task():
+            state.writer.cancel()
+    
     async def disconnect_all(self):
         """Disconnect all WebSocket clients"""
-        for user_id in list(self.active_connections.keys()):
+        for user_id, _ in self._recipients:
             self.disconnect(user_id)
         
         logger.info("All enhanced WebSocket connections closed")
     
+    def _refresh_recipients(self):
+        """Snapshot the send queues; connect/disconnect never await mid-update, so no lock is needed"""
+        self._recipients = tuple((user_id, state.queue) for user_id, state in self.users.items())
+    
     async def send_message(self, user_id: str, message: dict):
         """Send a message to a specific user"""
-        if user_id in self.active_connections:
-            try:
-                await self.active_connections[user_id].send_text(json.dumps(message))
-                logger.debug("Message sent", user_id=user_id, message_type=message.get("type"))
-            except Exception as e:
-                logger.error("Failed to send message", user_id=user_id, error=str(e))
-                await self.disconnect(user_id)
+        state = self.users.get(user_id)
+        if state is None:
+            return
+        self._enqueue(user_id, state.queue, (message.get("type"), _encode(message)))
+    
+    def _enqueue(self, user_id: str, queue: asyncio.Queue, frame: Tuple[Optional[str], str]):
+        """Queue an already-serialized (message_type, payload) frame for a user's writer task"""
+        if queue.qsize() >= SEND_QUEUE_HIGH_WATER:
+            self._shed(user_id, queue)
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # A real message is worth more than a stale snapshot already queued
+            if frame[0] not in COALESCED_TYPES and self._evict_snapshot(queue):
+                queue.put_nowait(frame)
+            else:
+                logger.warning("Send queue full, dropping message", user_id=user_id)
+    
+    def _shed(self, user_id: str, queue: asyncio.Queue):
+        """Collapse a backed-up queue to the newest snapshot frames and warn the client once"""
+        frames = []
+        while not queue.empty():
+            frames.append(queue.get_nowait())
+        kept = _coalesce(frames)
+        for frame in kept:
+            queue.put_nowait(frame)
+        
+        state = self.users.get(user_id)
+        if state is not None and not state.is_slow:
+            state.is_slow = True
+            queue.put_nowait(("slow_client", _encode({
+                "type": "slow_client",
+                "data": {"queued": len(kept)},
+                "timestamp": iso_utc_now()
+            })))
+            logger.warning("Slow WebSocket client", user_id=user_id, queued=len(frames), kept=len(kept))
+    
+    @staticmethod
+    def _evict_snapshot(queue: asyncio.Queue) -> bool:
+        """Remove the oldest coalescable frame from a queue; False if there is none"""
+        frames = []
+        while not queue.empty():
+            frames.append(queue.get_nowait())
+        for i, (message_type, _) in enumerate(frames):
+            if message_type in COALESCED_TYPES:
+                del frames[i]
+                break
+        for frame in frames:
+            queue.put_nowait(frame)
+        return len(frames) < queue.maxsize
+    
+    async def _writer(self, user_id: str, state: UserState):
+        """Drain a user's send queue so slow sockets never block producers
+        
+        Frames that are already queued go out together as a single "batch"
+        frame. After a coalescable frame the writer waits briefly so bursts of
+        snapshot updates collapse into the newest one.
+        """
+        websocket, queue = state.websocket, state.queue
+        while True:
+            frames = [await queue.get()]
+            if frames[0][0] in COALESCED_TYPES:
+                await asyncio.sleep(COALESCE_WINDOW)
+            while not queue.empty():
+                frames.append(queue.get_nowait())
+            
+            payloads = [payload for _, payload in _coalesce(frames)]
+            if len(payloads) == 1:
+                payload = payloads[0]
+            else:
+                payload = '{"type":"batch","items":[' + ",".join(payloads) + "]}"
+            
+            # Ride out a transient hiccup before giving up on the connection
+            for attempt in range(1, SEND_ATTEMPTS + 1):
+                try:
+                    await websocket.send_text(payload)
+                    break
+                except Exception as e:
+                    if attempt == SEND_ATTEMPTS:
+                        logger.error("Failed to send message", user_id=user_id, error=str(e))
+                        self.disconnect(user_id, state)
+                        return
+                    logger.warning("Send failed, retrying", user_id=user_id, error=str(e))
+                    await asyncio.sleep(SEND_RETRY_DELAY)
+            
+            if queue.empty():
+                state.is_slow = False
     
     async def broadcast_message(self, message: dict, exclude_user: Optional[str] = None):
         """Broadcast a message to all connected users"""
-        for user_id in list(self.active_connections.keys()):
+        # Serialize once; every recipient queues the same frame object
+        frame = (message.get("type"), _encode(message))
+        for user_id, queue in self._recipients:
             if user_id != exclude_user:
-                await self.send_message(user_id, message)
+                self._enqueue(user_id, queue, frame)
+    
+    async def _dispatch(self, user_id: str, type_: str, data: Any):
+        """Build a timestamped message envelope and send it to a user"""
+        await self.send_message(user_id, {
+            "type": type_,
+            "data": data,
+            "timestamp": iso_utc_now()
+        })
+    
+    def _send_template(self, user_id: str, template: Tuple[str, str]):
+        """Queue a _stamped_template message with the current timestamp"""
+        state = self.users.get(user_id)
+        if state is not None:
+            message_type, head = template
+            self._enqueue(user_id, state.queue, (message_type, head + iso_utc_now() + '"}'))
     
     def get_connected_users(self) -> List[str]:
         """Get list of connected user IDs"""
-        return list(self.active_connections.keys())
+        return list(self.users)
     
     def is_connected(self, user_id: str) -> bool:
         """Check if a user is connected"""
-        return user_id in self.active_connections
-    
-    async def send_multi_modal_response(self, user_id: str, response: dict):
-        """Send a multi-modal tutor response"""
-        message = {
-            "type": "tutor_response",
-            "data": {
-                **response,
-                "context": self.user_contexts.get(user_id, {}),
-                "session_info": {
-                    "session_id": self.user_sessions.get(user_id),
-                    "message_count": self.user_contexts.get(user_id, {}).get("message_count", 0)
-                }
-            },
-            "timestamp": datetime.utcnow().isoformat()
+        return user_id in self.users
+    
+    async def send_multi_modal_response(self, user_id: str, response: Union[BaseModel, dict]):
+        """Send a multi-modal tutor response
+        
+        A pydantic response is serialized straight to JSON by pydantic-core and
+        spliced into the frame, so no intermediate dict is built.
+        """
+        state = self.users.get(user_id)
+        if state is None:
+            return
+        context = state.context
+        extra = {
+            "context": self._format_context(context),
+            "session_info": {
+                "session_id": state.session_id,
+                "message_count": context.get("message_count", 0)
+            }
         }
-        await self.send_message(user_id, message)
+        if not isinstance(response, BaseModel):
+            await self._dispatch(user_id, "tutor_response", {**response, **extra})
+            return
+        
+        body = response.model_dump_json()
+        # Later keys win in JSON.parse, matching the dict merge above
+        data = _encode(extra) if body == "{}" else body[:-1] + "," + _encode(extra)[1:]
+        self._enqueue(user_id, state.queue, (
+            "tutor_response",
+            '{"type":"tutor_response","data":' + data + ',"timestamp":"' + iso_utc_now() + '"}'
+        ))
     
     async def send_speech_analysis(self, user_id: str, analysis: dict):
         """Send speech analysis results"""
-        message = {
-            "type": "speech_analysis",
-            "data": analysis,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        await self.send_message(user_id, message)
+        await self._dispatch(user_id, "speech_analysis", analysis)
     
     async def send_progress_insight(self, user_id: str, insight: dict):
         """Send progress insights"""
-        message = {
-            "type": "progress_insight",
-            "data": insight,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        await self.send_message(user_id, message)
+        await self._dispatch(user_id, "progress_insight", insight)
     
     async def send_audio_response(self, user_id: str, audio_data: bytes, audio_format: str = "wav"):
         """Send audio response"""
-        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-        message = {
-            "type": "audio_response",
-            "data": {
-                "audio": audio_base64,
-                "format": audio_format,
-                "duration": len(audio_data) / 16000  # Approximate duration
-            },
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        await self.send_message(user_id, message)
+        # SIMD codec; base64 output is pure ASCII so skip UTF-8 validation
+        audio_base64 = pybase64.b64encode(audio_data).decode('ascii')
+        await self._dispatch(user_id, "audio_response", {
+            "audio": audio_base64,
+            "format": audio_format,
+            "duration": len(audio_data) / 16000  # Approximate duration
+        })
     
     async def send_interactive_exercise(self, user_id: str, exercise: dict):
         """Send interactive exercise"""
-        message = {
-            "type": "interactive_exercise",
-            "data": exercise,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        await self.send_message(user_id, message)
+        await self._dispatch(user_id, "interactive_exercise", exercise)
     
     async def send_adaptive_feedback(self, user_id: str, feedback: dict):
         """Send adaptive feedback"""
-        message = {
-            "type": "adaptive_feedback",
-            "data": feedback,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        await self.send_message(user_id, message)
+        await self._dispatch(user_id, "adaptive_feedback", feedback)
+    
+    async def send_learning_path(self, user_id: str, learning_path: dict):
+        """Send a generated learning path"""
+        await self._dispatch(user_id, "learning_path", learning_path)
     
     async def send_typing_indicator(self, user_id: str, is_typing: bool):
         """Send typing indicator"""
-        message = {
-            "type": "typing_indicator",
-            "data": {"is_typing": is_typing},
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        await self.send_message(user_id, message)
+        await self._dispatch(user_id, "typing_indicator", {"is_typing": is_typing})
     
     async def send_connection_status(self, user_id: str, status: str):
         """Send connection status update"""
-        message = {
-            "type": "connection_status",
-            "data": {"status": status},
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        await self.send_message(user_id, message)
+        await self._dispatch(user_id, "connection_status", {"status": status})
     
     def update_user_context(self, user_id: str, context_updates: Dict[str, Any]):
         """Update user context"""
-        if user_id in self.user_contexts:
-            self.user_contexts[user_id].update(context_updates)
-            self.user_contexts[user_id]["last_activity"] = datetime.utcnow()
-            logger.debug("User context updated", user_id=user_id, updates=context_updates)
+        state = self.users.get(user_id)
+        if state is not None:
+            context = state.context
+            # Most messages repeat the current personality; only write and stamp real changes
+            changed = {key: value for key, value in context_updates.items() if context.get(key) != value}
+            if changed:
+                context.update(changed)
+                state.session_info = None
+                context["last_activity"] = time.time()
+                if _log_level.isEnabledFor(logging.DEBUG):
+                    logger.debug("User context updated", user_id=user_id, updates=changed)
     
     def increment_message_count(self, user_id: str):
         """Increment message count for user"""
-        if user_id in self.user_contexts:
-            self.user_contexts[user_id]["message_count"] += 1
+        state = self.users.get(user_id)
+        if state is not None:
+            state.context["message_count"] += 1
+            state.session_info = None
     
     async def process_audio_chunk(self, user_id: str, audio_chunk: bytes):
         """Process incoming audio chunk"""
-        if user_id in self.audio_buffers:
-            self.audio_buffers[user_id].append(audio_chunk)
+        state = self.users.get(user_id)
+        if state is not None:
+            buffer = state.audio_buffer
+            buffer.extend(audio_chunk)
+            # Keep only the most recent audio once the cap is reached
+            overflow = len(buffer) - MAX_AUDIO_BUFFER_BYTES
+            if overflow > 0:
+                del buffer[:overflow]
             
             # Analyze audio level
             audio_level = self.analyze_audio_level(audio_chunk)
             
-            # Send audio level update
-            await self.send_message(user_id, {
-                "type": "audio_level",
-                "data": {"level": audio_level},
-                "timestamp": datetime.utcnow().isoformat()
-            })
+            # Send audio level update; high-frequency, so the client stamps it
+            await self.send_message(user_id, {"type": "audio_level", "data": {"level": audio_level}})
     
     def analyze_audio_level(self, audio_chunk: bytes) -> float:
         """Analyze audio level from chunk"""
         try:
-            # Convert bytes to numpy array (assuming 16-bit PCM)
-            audio_array = np.frombuffer(audio_chunk, dtype=np.int16)
-            if len(audio_array) > 0:
-                # Calculate RMS (Root Mean Square) for audio level
-                rms = np.sqrt(np.mean(audio_array.astype(np.float32) ** 2))
-                # Normalize to 0-100 range
-                level = min(100.0, (rms / 32768.0) * 100.0)
-                return float(level)
+            # View the bytes as 16-bit PCM; the compiled kernel reads them in place
+            return rms_level(np.frombuffer(audio_chunk, dtype=np.int16))
         except Exception as e:
             logger.error("Error analyzing audio level", error=str(e))
         
@@ -249,71 +486,9 @@ class EnhancedWebSocketManager:
             message_type = message.get("type")
             self.increment_message_count(user_id)
             
-            if message_type == "ping":
-                # Respond to ping with pong
-                await self.send_message(user_id, {
-                    "type": "pong",
-                    "data": {"timestamp": datetime.utcnow().isoformat()}
-                })
-            
-            elif message_type == "user_message":
-                # Handle text message
-                await self.handle_text_message(user_id, message)
-            
-            elif message_type == "audio_message":
-                # Handle audio message
-                await self.handle_audio_message(user_id, message)
-            
-            elif message_type == "voice_start":
-                # Handle voice recording start
-                await self.handle_voice_start(user_id, message)
-            
-            elif message_type == "voice_stop":
-                # Handle voice recording stop
-                await self.handle_voice_stop(user_id, message)
-            
-            elif message_type == "typing_start":
-                # Handle typing start
-                self.typing_indicators[user_id] = True
-                await self.broadcast_typing_indicator(user_id, True)
-            
-            elif message_type == "typing_stop":
-                # Handle typing stop
-                self.typing_indicators[user_id] = False
-                await self.broadcast_typing_indicator(user_id, False)
-            
-            elif message_type == "personality_update":
-                # Handle personality update
-                await self.handle_personality_update(user_id, message)
-            
-            elif message_type == "session_start":
-                # Handle session start
-                session_id = message.get("session_id")
-                if session_id:
-                    self.user_sessions[user_id] = session_id
-                    await self.send_message(user_id, {
-                        "type": "session_started",
-                        "data": {"session_id": session_id}
-                    })
-            
-            elif message_type == "session_end":
-                # Handle session end
-                session_id = self.user_sessions.get(user_id)
-                if session_id:
-                    await self.send_message(user_id, {
-                        "type": "session_ended",
-                        "data": {"session_id": session_id}
-                    })
-                    del self.user_sessions[user_id]
-            
-            elif message_type == "get_recommendations":
-                # Handle recommendation request
-                await self.handle_recommendation_request(user_id, message)
-            
-            elif message_type == "get_learning_path":
-                # Handle learning path request
-                await self.handle_learning_path_request(user_id, message)
-            
+            handler = self._handlers.get(message_type)
+            if handler is not None:
+                await handler(user_id, message)
             else:
                 logger.warning("Unknown message type", user_id=user_id, message_type=message_type)
                 await self.send_message(user_id, {
@@ -328,6 +503,46 @@ class EnhancedWebSocketManager:
                 "data": {"message": "Failed to process message"}
             })
     
+    async def handle_ping(self, user_id: str, message: dict):
+        """Respond to ping with pong"""
+        await self.send_message(user_id, {
+            "type": "pong",
+            "data": {"timestamp": iso_utc_now()}
+        })
+    
+    async def handle_typing_start(self, user_id: str, message: dict):
+        """Handle typing start"""
+        self._set_typing(user_id, True)
+        await self.broadcast_typing_indicator(user_id, True)
+    
+    async def handle_typing_stop(self, user_id: str, message: dict):
+        """Handle typing stop"""
+        self._set_typing(user_id, False)
+        await self.broadcast_typing_indicator(user_id, False)
+    
+    async def handle_session_start(self, user_id: str, message: dict):
+        """Handle session start"""
+        session_id = message.get("session_id")
+        state = self.users.get(user_id)
+        if session_id and state is not None:
+            state.session_id = session_id
+            state.session_info = None
+            await self.send_message(user_id, {
+                "type": "session_started",
+                "data": {"session_id": session_id}
+            })
+    
+    async def handle_session_end(self, user_id: str, message: dict):
+        """Handle session end"""
+        state = self.users.get(user_id)
+        if state is not None and state.session_id:
+            await self.send_message(user_id, {
+                "type": "session_ended",
+                "data": {"session_id": state.session_id}
+            })
+            state.session_id = None
+            state.session_info = None
+    
     async def handle_text_message(self, user_id: str, message: dict):
         """Handle text message from user"""
         text = message.get("message", "")
@@ -339,67 +554,71 @@ class EnhancedWebSocketManager:
             "personality": personality
         })
         
-        logger.debug("Text message received", user_id=user_id, message_length=len(text))
+        if _log_level.isEnabledFor(logging.DEBUG):
+            logger.debug("Text message received", user_id=user_id, message_length=len(text))
         
         # This will be processed by the main application logic
         # The response will be sent via send_multi_modal_response
     
     async def handle_audio_message(self, user_id: str, message: dict):
-        """Handle audio message from user"""
-        audio_data = message.get("audio_data")
-        if audio_data:
-            # Decode base64 audio data
+        """Handle audio message from user
+        
+        Audio arrives as raw bytes under "audio" (binary frames), or as base64
+        under "audio_data" from older clients.
+        """
+        audio_bytes = message.get("audio")
+        if audio_bytes is None and message.get("audio_data"):
+            audio_bytes = pybase64.b64decode(message["audio_data"])
+        if audio_bytes:
             try:
-                audio_bytes = base64.b64decode(audio_data)
+                # Buffers the chunk and reports its level
                 await self.process_audio_chunk(user_id, audio_bytes)
                 
-                # Store in buffer for processing
-                if user_id in self.audio_buffers:
-                    self.audio_buffers[user_id].append(audio_bytes)
-                
-                logger.debug("Audio message received", user_id=user_id, audio_size=len(audio_bytes))
+                if _log_level.isEnabledFor(logging.DEBUG):
+                    logger.debug("Audio message received", user_id=user_id, audio_size=len(audio_bytes))
                 
             except Exception as e:
                 logger.error("Error processing audio data", user_id=user_id, error=str(e))
     
     async def handle_voice_start(self, user_id: str, message: dict):
         """Handle voice recording start"""
-        self.audio_buffers[user_id] = []
-        await self.send_message(user_id, {
-            "type": "voice_started",
-            "data": {"message": "Voice recording started"},
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        state = self.users.get(user_id)
+        if state is not None:
+            if self._is_repeated_voice_control(state, "voice_start"):
+                return
+            state.audio_buffer = bytearray()
+        self._send_template(user_id, _VOICE_STARTED)
         logger.info("Voice recording started", user_id=user_id)
     
     async def handle_voice_stop(self, user_id: str, message: dict):
         """Handle voice recording stop"""
-        if user_id in self.audio_buffers:
-            # Process complete audio buffer
-            complete_audio = b''.join(self.audio_buffers[user_id])
+        state = self.users.get(user_id)
+        if state is not None and not self._is_repeated_voice_control(state, "voice_stop"):
+            buffer = state.audio_buffer
+            audio_size = len(buffer)
             
             # Send for speech analysis
-            await self.send_message(user_id, {
-                "type": "voice_processing",
-                "data": {"message": "Processing voice input..."},
-                "timestamp": datetime.utcnow().isoformat()
-            })
+            self._send_template(user_id, _VOICE_PROCESSING)
             
             # Clear buffer
-            self.audio_buffers[user_id] = []
+            buffer.clear()
             
-            logger.info("Voice recording stopped", user_id=user_id, audio_size=len(complete_audio))
+            logger.info("Voice recording stopped", user_id=user_id, audio_size=audio_size)
+    
+    @staticmethod
+    def _is_repeated_voice_control(state: UserState, message_type: str) -> bool:
+        """Record a voice control message; True if the same one arrived within the debounce window"""
+        now = time.monotonic_ns()
+        last = state.voice_control_ns.get(message_type)
+        state.voice_control_ns[message_type] = now
+        return last is not None and now - last < VOICE_CONTROL_DEBOUNCE_NS
     
     async def handle_personality_update(self, user_id: str, message: dict):
         """Handle personality update"""
         personality = message.get("personality", {})
         self.update_user_context(user_id, {"personality": personality})
         
-        await self.send_message(user_id, {
-            "type": "personality_updated",
-            "data": {"personality": personality},
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        await self._dispatch(user_id, "personality_updated", {"personality": personality})
         
         logger.info("Personality updated", user_id=user_id, personality=personality)
     
@@ -413,28 +632,49 @@ class EnhancedWebSocketManager:
         logger.debug("Learning path request received", user_id=user_id)
         # This will be processed by the main application logic
     
+    def _set_typing(self, user_id: str, is_typing: bool):
+        state = self.users.get(user_id)
+        if state is not None:
+            state.is_typing = is_typing
+    
     async def broadcast_typing_indicator(self, user_id: str, is_typing: bool):
         """Broadcast typing indicator to other users"""
         await self.broadcast_message({
             "type": "user_typing",
             "data": {"user_id": user_id, "is_typing": is_typing},
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_utc_now()
         }, exclude_user=user_id)
     
     def get_user_context(self, user_id: str) -> Dict[str, Any]:
         """Get user context"""
-        return self.user_contexts.get(user_id, {})
+        state = self.users.get(user_id)
+        return state.context if state else {}
     
     def get_session_info(self, user_id: str) -> Dict[str, Any]:
-        """Get session information for user"""
-        context = self.user_contexts.get(user_id, {})
-        return {
-            "session_id": self.user_sessions.get(user_id),
-            "message_count": context.get("message_count", 0),
-            "session_start": context.get("session_start"),
-            "last_activity": context.get("last_activity"),
-            "personality": context.get("personality", {})
-        }
+        """Get session information for user
+        
+        The dict is cached until the session or context changes, so callers
+        must treat it as read-only.
+        """
+        state = self.users.get(user_id)
+        if state is None:
+            return {
+                "session_id": None,
+                "message_count": 0,
+                "session_start": None,
+                "last_activity": None,
+                "personality": {}
+            }
+        if state.session_info is None:
+            context = state.context
+            state.session_info = {
+                "session_id": state.session_id,
+                "message_count": context["message_count"],
+                "session_start": iso_utc(context["session_start"]),
+                "last_activity": iso_utc(context["last_activity"]),
+                "personality": context.get("personality", {})
+            }
+        return state.session_info
 
 # Backward compatibility
 WebSocketManager = EnhancedWebSocketManager
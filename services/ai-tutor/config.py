@@ -13,6 +13,7 @@ class Settings(BaseSettings):
     debug: bool = Field(default=False, env="DEBUG")
     host: str = Field(default="0.0.0.0", env="HOST")
     port: int = Field(default=8001, env="PORT")
+    workers: int = Field(default=1, env="WORKERS")
     
     # CORS and Security
     cors_origins: List[str] = Field(
@@ -36,6 +37,16 @@ class Settings(BaseSettings):
         env="REDIS_URL"
     )
     
+    # Background Tasks
+    celery_broker_url: str = Field(
+        default="redis://localhost:6379/1",
+        env="CELERY_BROKER_URL"
+    )
+    celery_result_backend: str = Field(
+        default="redis://localhost:6379/1",
+        env="CELERY_RESULT_BACKEND"
+    )
+    
     # AI Model Configuration
     openai_api_key: str = Field(
         default="your-openai-api-key",
@@ -55,6 +66,10 @@ class Settings(BaseSettings):
         default="gpt-4",
         env="DEFAULT_MODEL"
     )
+    embedding_model: str = Field(
+        default="text-embedding-3-small",
+        env="EMBEDDING_MODEL"
+    )
     max_tokens: int = Field(
         default=1000,
         env="MAX_TOKENS"
@@ -101,6 +116,24 @@ class Settings(BaseSettings):
         default=10,
         env="MAX_RECOMMENDATIONS"
     )
+    response_cache_ttl: int = Field(
+        default=120,
+        env="RESPONSE_CACHE_TTL"
+    )
+    # Tutor replies reused for near-identical messages, per teaching style and focus area
+    tutor_reply_cache_size: int = Field(
+        default=256,
+        env="TUTOR_REPLY_CACHE_SIZE"
+    )
+    tutor_reply_similarity: float = Field(
+        default=0.92,
+        env="TUTOR_REPLY_SIMILARITY"
+    )
+    # Per-user adaptive contexts kept in memory, least recently active evicted first
+    adaptive_context_cache_size: int = Field(
+        default=10000,
+        env="ADAPTIVE_CONTEXT_CACHE_SIZE"
+    )
     
     # Logging
     log_level: str = Field(
@@ -123,6 +156,16 @@ class Settings(BaseSettings):
         default=20,
         env="WEBSOCKET_PING_TIMEOUT"
     )
+    # Largest inbound frame accepted, sized for long binary audio chunks (bytes)
+    websocket_max_size: int = Field(
+        default=16 * 1024 * 1024,
+        env="WEBSOCKET_MAX_SIZE"
+    )
+    # Off by default: most frames are small and broadcasts would be deflated per connection
+    websocket_per_message_deflate: bool = Field(
+        default=False,
+        env="WEBSOCKET_PER_MESSAGE_DEFLATE"
+    )
     
     # Tutor Personality
     tutor_personality: str = Field(
@@ -154,3 +197,9 @@ class Settings(BaseSettings):
 
 # Create settings instance
 settings = Settings()
+
+# Plain copies of fields read on every request; settings are fixed at startup
+VERSION = settings.version
+CORS_ORIGINS = tuple(settings.cors_origins)
+HOST = settings.host
+PORT = settings.port
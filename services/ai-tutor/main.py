@@ -1,24 +1,33 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 import structlog
 import uvicorn
 from contextlib import asynccontextmanager
 import asyncio
-from typing import Dict, List
-import json
-import base64
+import logging
+import logging.handlers
+import queue
+import sys
+import binascii
+import pybase64
+import orjson
+import httpx
+from redis.asyncio import Redis
 
-from config import settings
+from config import settings, VERSION, CORS_ORIGINS, HOST, PORT
 from api.routes import router
 from api.websocket import EnhancedWebSocketManager
 from services.tutor_service import TutorService
 from services.recommendation_service import RecommendationService
 from services.learning_path_service import LearningPathService
-from services.advanced_tutor_service import AdvancedTutorService
+from services.advanced_tutor_service import AdvancedTutorService, VOICE_INPUT_MESSAGE
 from services.enhanced_learning_path_service import EnhancedLearningPathService
 from services.speech_processor import SpeechProcessor
 from models.advanced_tutor import InteractionMode
+from tasks import LEARNING_PATH_CHANNEL
 
 # Configure structured logging
 structlog.configure(
@@ -31,7 +40,7 @@ structlog.configure(
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=lambda event, **kw: orjson.dumps(event, **kw).decode())
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
@@ -39,6 +48,12 @@ structlog.configure(
     cache_logger_on_first_use=True,
 )
 
+# Log calls only enqueue the rendered line; a background thread does the stdout writes.
+# Installed and started by lifespan, so importing this module leaves logging alone.
+_log_queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+log_listener = logging.handlers.QueueListener(_log_queue_handler.queue, logging.StreamHandler(sys.stdout))
+
 logger = structlog.get_logger()
 
 # WebSocket connection manager
@@ -58,37 +73,76 @@ api.routes.tutor_service = tutor_service
 api.routes.recommendation_service = recommendation_service
 api.routes.learning_path_service = learning_path_service
 
+# Idle upstream connections kept open in the shared HTTP pool
+HTTP_KEEPALIVE_CONNECTIONS = 100
+
+async def relay_learning_paths(redis_client: Redis):
+    """Push learning paths finished by the Celery worker to connected users"""
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(LEARNING_PATH_CHANNEL)
+                async for event in pubsub.listen():
+                    if event["type"] != "message":
+                        continue
+                    result = orjson.loads(event["data"])
+                    await websocket_manager.send_learning_path(result["user_id"], {
+                        "task_id": result["task_id"],
+                        "learning_path": result["learning_path"]
+                    })
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Learning path relay failed, resubscribing", error=str(e))
+            await asyncio.sleep(1)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    logger.info("Starting AI Tutor Service", version=settings.version)
+    logging.basicConfig(handlers=[_log_queue_handler], level=settings.log_level.upper())
+    log_listener.start()
+    logger.info("Starting AI Tutor Service", version=VERSION)
+    
+    # One keep-alive pool for the services' calls to the API, analytics and model providers
+    http_client = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS))
+    
+    # Initialize services concurrently
+    await asyncio.gather(
+        tutor_service.initialize(http_client),
+        recommendation_service.initialize(http_client),
+        learning_path_service.initialize(http_client),
+        advanced_tutor_service.initialize(http_client),
+        enhanced_learning_path_service.initialize()
+    )
     
-    # Initialize services
-    await tutor_service.initialize()
-    await recommendation_service.initialize()
-    await learning_path_service.initialize()
-    await advanced_tutor_service.initialize()
-    await enhanced_learning_path_service.initialize()
+    # Response cache for the recommendation endpoints
+    api.routes.redis_client = Redis.from_url(settings.redis_url)
+    relay_task = asyncio.create_task(relay_learning_paths(api.routes.redis_client))
     
     logger.info("AI Tutor Service started successfully")
     yield
     
     # Cleanup
     logger.info("Shutting down AI Tutor Service")
+    relay_task.cancel()
     await websocket_manager.disconnect_all()
+    await api.routes.redis_client.aclose()
+    await http_client.aclose()
+    log_listener.stop()
 
 # Create FastAPI app
 app = FastAPI(
     title="IELTS AI Tutor Service",
     description="AI-powered tutoring and personalized learning for IELTS preparation",
-    version=settings.version,
+    version=VERSION,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
 # Add middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins,
+    allow_origins=list(CORS_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -99,125 +153,190 @@ app.add_middleware(
     allowed_hosts=settings.allowed_hosts
 )
 
+# Compress larger JSON bodies (learning paths, recommendations)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
 # Include routers
 app.include_router(router, prefix="/api/v1")
 
+# Legacy base64 audio longer than this is decoded in a worker thread (characters)
+BASE64_OFFLOAD_SIZE = 64 * 1024
+
+# Audio messages waiting for speech analysis per connection
+AUDIO_QUEUE_SIZE = 4
+# Chat, recommendation and learning path requests waiting per connection
+WORK_QUEUE_SIZE = 8
+
+# Interaction modes by wire value; unknown values fall back to text
+INTERACTION_MODES = {mode.value: mode for mode in InteractionMode}
+
+async def handle_user_message(user_id: str, message: dict):
+    """Answer a chat message with the advanced tutor"""
+    response = await advanced_tutor_service.advanced_chat(
+        user_id=user_id,
+        message=message.get("message", ""),
+        interaction_mode=INTERACTION_MODES.get(message.get("interaction_mode", "text"), InteractionMode.TEXT),
+        context=message.get("context", {})
+    )
+    
+    await websocket_manager.send_multi_modal_response(user_id, response)
+
+async def handle_audio_message(user_id: str, message: dict):
+    """Analyze speech and answer it with the advanced tutor"""
+    speech_result = await speech_processor.process_audio(
+        audio_data=message["audio"],
+        user_id=user_id,
+        format_type=message.get("format", "wav")
+    )
+    
+    # Send speech analysis
+    await websocket_manager.send_speech_analysis(user_id, speech_result)
+    
+    # Generate tutor response based on speech analysis
+    if speech_result.get("analysis"):
+        response = await advanced_tutor_service.advanced_chat(
+            user_id=user_id,
+            message=VOICE_INPUT_MESSAGE,
+            interaction_mode=InteractionMode.VOICE,
+            context={"speech_analysis": speech_result}
+        )
+        await websocket_manager.send_multi_modal_response(user_id, response)
+
+async def handle_get_recommendations(user_id: str, message: dict):
+    """Send content recommendations"""
+    recommendations = await recommendation_service.get_recommendations(
+        user_id=user_id,
+        module=message.get("module"),
+        limit=message.get("limit", 5)
+    )
+    
+    await websocket_manager.send_message(user_id, {
+        "type": "recommendations",
+        "data": recommendations
+    })
+
+async def handle_get_learning_path(user_id: str, message: dict):
+    """Send a learning path from the enhanced learning path service"""
+    learning_path = await enhanced_learning_path_service.generate_enhanced_path(
+        user_id=user_id,
+        target_score=message.get("target_score"),
+        timeframe=message.get("timeframe", "30")
+    )
+    
+    await websocket_manager.send_message(user_id, {
+        "type": "learning_path",
+        "data": learning_path
+    })
+
+# Message type -> service handler, run by a connection worker after the manager
+# has handled the message. voice_start/voice_stop are acknowledged by the manager alone.
+MESSAGE_HANDLERS = {
+    "user_message": handle_user_message,
+    "audio_message": handle_audio_message,
+    "get_recommendations": handle_get_recommendations,
+    "get_learning_path": handle_get_learning_path
+}
+
+async def message_worker(user_id: str, work_queue: asyncio.Queue):
+    """Run queued service handlers for one connection without holding up its receive loop"""
+    while True:
+        message = await work_queue.get()
+        try:
+            await MESSAGE_HANDLERS[message["type"]](user_id, message)
+        except Exception as e:
+            logger.error("Message processing failed", user_id=user_id, message_type=message["type"], error=str(e))
+
 # WebSocket endpoint for real-time tutoring
 @app.websocket("/ws/tutor/{user_id}")
 async def websocket_tutor_endpoint(websocket: WebSocket, user_id: str):
-    await websocket_manager.connect(websocket, user_id)
+    connection = await websocket_manager.connect(websocket, user_id)
+    # The receive loop only parses and routes; service calls run on two workers so
+    # chat is never queued behind speech analysis. Bounded queues pause a client
+    # that outpaces them rather than buffering without limit.
+    audio_queue = asyncio.Queue(maxsize=AUDIO_QUEUE_SIZE)
+    work_queue = asyncio.Queue(maxsize=WORK_QUEUE_SIZE)
+    workers = (
+        asyncio.create_task(message_worker(user_id, audio_queue)),
+        asyncio.create_task(message_worker(user_id, work_queue))
+    )
     try:
         while True:
-            # Receive message from client
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            # Receive message from client; binary frames are raw audio chunks
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            if frame.get("bytes") is not None:
+                message = {"type": "audio_message", "audio": frame["bytes"]}
+            else:
+                message = orjson.loads(frame["text"])
+                if message.get("type") == "audio_message":
+                    # Legacy base64 audio; decode once for every consumer
+                    audio_data = message.pop("audio_data", "")
+                    try:
+                        if len(audio_data) > BASE64_OFFLOAD_SIZE:
+                            # Large chunks decode off the loop so other sessions keep flowing
+                            message["audio"] = await asyncio.to_thread(pybase64.b64decode, audio_data)
+                        else:
+                            message["audio"] = pybase64.b64decode(audio_data)
+                    except binascii.Error as e:
+                        logger.warning("Invalid base64 audio", user_id=user_id, error=str(e))
+                        message["audio"] = b""
             
             # Handle message using enhanced WebSocket manager
             await websocket_manager.handle_message(user_id, message)
             
-            # Process message based on type
-            if message.get("type") == "user_message":
-                # Use advanced tutor service for enhanced responses
-                response = await advanced_tutor_service.advanced_chat(
-                    user_id=user_id,
-                    message=message.get("message", ""),
-                    interaction_mode=InteractionMode(message.get("interaction_mode", "text")),
-                    context=message.get("context", {})
-                )
-                
-                await websocket_manager.send_multi_modal_response(user_id, response.dict())
-                
-            elif message.get("type") == "audio_message":
-                # Process audio message
-                audio_data = base64.b64decode(message.get("audio_data", ""))
-                speech_result = await speech_processor.process_audio(
-                    audio_data=audio_data,
-                    user_id=user_id,
-                    format_type=message.get("format", "wav")
-                )
-                
-                # Send speech analysis
-                await websocket_manager.send_speech_analysis(user_id, speech_result)
-                
-                # Generate tutor response based on speech analysis
-                if speech_result.get("analysis"):
-                    response = await advanced_tutor_service.advanced_chat(
-                        user_id=user_id,
-                        message="[Voice input processed]",
-                        interaction_mode=InteractionMode.VOICE,
-                        context={"speech_analysis": speech_result}
-                    )
-                    await websocket_manager.send_multi_modal_response(user_id, response.dict())
-                
-            elif message.get("type") == "get_recommendations":
-                recommendations = await recommendation_service.get_recommendations(
-                    user_id=user_id,
-                    module=message.get("module"),
-                    limit=message.get("limit", 5)
-                )
-                
-                await websocket_manager.send_message(user_id, {
-                    "type": "recommendations",
-                    "data": recommendations
-                })
-                
-            elif message.get("type") == "get_learning_path":
-                # Use enhanced learning path service
-                learning_path = await enhanced_learning_path_service.generate_enhanced_path(
-                    user_id=user_id,
-                    target_score=message.get("target_score"),
-                    timeframe=message.get("timeframe", "30")
-                )
-                
-                await websocket_manager.send_message(user_id, {
-                    "type": "learning_path",
-                    "data": learning_path
-                })
-                
-            elif message.get("type") == "voice_start":
-                # Handle voice recording start
-                await websocket_manager.send_message(user_id, {
-                    "type": "voice_started",
-                    "data": {"message": "Voice recording started"}
-                })
-                
-            elif message.get("type") == "voice_stop":
-                # Handle voice recording stop
-                await websocket_manager.send_message(user_id, {
-                    "type": "voice_processing",
-                    "data": {"message": "Processing voice input..."}
-                })
+            message_type = message.get("type")
+            if message_type == "audio_message":
+                await audio_queue.put(message)
+            elif message_type in MESSAGE_HANDLERS:
+                await work_queue.put(message)
                 
     except WebSocketDisconnect:
-        websocket_manager.disconnect(user_id)
+        websocket_manager.disconnect(user_id, connection)
         logger.info("WebSocket disconnected", user_id=user_id)
     except Exception as e:
         logger.error("WebSocket error", user_id=user_id, error=str(e))
-        websocket_manager.disconnect(user_id)
+        websocket_manager.disconnect(user_id, connection)
+    finally:
+        for worker in workers:
+            worker.cancel()
+
+# Health and root bodies never change after startup, so they are serialized once
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "ai-tutor",
+    "version": VERSION
+})
+ROOT_BODY = orjson.dumps({
+    "message": "IELTS AI Tutor Service",
+    "version": VERSION,
+    "docs": "/docs"
+})
 
-@app.get("/health")
+@app.get("/health", response_class=Response)
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": "ai-tutor",
-        "version": settings.version
-    }
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
-@app.get("/")
+@app.get("/", response_class=Response)
 async def root():
     """Root endpoint"""
-    return {
-        "message": "IELTS AI Tutor Service",
-        "version": settings.version,
-        "docs": "/docs"
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
-        host=settings.host,
-        port=settings.port,
+        host=HOST,
+        port=PORT,
         reload=settings.debug,
+        workers=settings.workers,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_max_size=settings.websocket_max_size,
+        ws_ping_interval=settings.websocket_ping_interval,
+        ws_ping_timeout=settings.websocket_ping_timeout,
+        ws_per_message_deflate=settings.websocket_per_message_deflate,
+        proxy_headers=True,
         log_level="info"
     )
@@ -6,8 +6,10 @@ and intelligent feedback generation.
 
 import structlog
 import httpx
-import json
-import asyncio
+import re
+import ahocorasick
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import openai
@@ -15,10 +17,10 @@ import anthropic
 from openai import AsyncOpenAI
 from anthropic import AsyncAnthropic
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 
 from config import settings
+from timestamps import iso_utc_now
+from services.response_cache import SemanticResponseCache, normalize_message, unit_vector
 from models.advanced_tutor import (
     MultiModalResponse, InteractiveExercise, SpeechAnalysis, ProgressInsight,
     AdaptiveContext, ErrorPattern, AdaptiveFeedback, LearningObjective,
@@ -30,51 +32,119 @@ from models.tutor import UserProgress
 
 logger = structlog.get_logger()
 
+# Keyword lexicons for the local sentiment check
+POSITIVE_WORDS = frozenset({"good", "great", "excellent", "thanks", "love", "easy", "clear"})
+NEGATIVE_WORDS = frozenset({"bad", "hard", "difficult", "confused", "confusing", "stuck", "frustrated"})
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+# Common learner errors by type (in production, use more sophisticated NLP)
+COMMON_ERRORS = {
+    "grammar": ["i is", "you was", "they has"],
+    "vocabulary": ["very good", "very bad", "very nice"],
+    "pronunciation": ["tink", "dat", "wut"]
+}
+
+def _build_error_automaton() -> ahocorasick.Automaton:
+    """Compile every error phrase into one automaton so a message is scanned once"""
+    automaton = ahocorasick.Automaton()
+    for error_type, error_phrases in COMMON_ERRORS.items():
+        for phrase in error_phrases:
+            automaton.add_word(phrase, (error_type, phrase))
+    automaton.make_automaton()
+    return automaton
+
+ERROR_AUTOMATON = _build_error_automaton()
+
+# Stand-in message for voice turns; the speech analysis in their context is the real input
+VOICE_INPUT_MESSAGE = "[Voice input processed]"
+
+# Recent error patterns kept on each adaptive context; the context is sent with every response
+MAX_ERROR_HISTORY = 50
+
+TEACHING_STYLE_PROMPTS = {
+    TeachingStyle.SUPPORTIVE: "Be encouraging and supportive. Focus on building confidence.",
+    TeachingStyle.STRUCTURED: "Provide clear, structured explanations with step-by-step guidance.",
+    TeachingStyle.CHALLENGING: "Challenge the student with advanced concepts and encourage critical thinking.",
+    TeachingStyle.EXPLORATORY: "Encourage exploration and discovery. Ask probing questions.",
+    TeachingStyle.CONVERSATIONAL: "Maintain a natural conversation flow while providing educational value.",
+    TeachingStyle.GAMIFIED: "Make learning fun and engaging with gamified elements."
+}
+
+# Quick replies offered with interactive responses, extended for some focus areas
+BASE_RESPONSE_OPTIONS = (
+    "I need more practice",
+    "Can you explain this further?",
+    "Show me an example",
+    "I'm ready for the next topic"
+)
+RESPONSE_OPTIONS = {
+    "speaking": BASE_RESPONSE_OPTIONS + ("Practice pronunciation",),
+    "writing": BASE_RESPONSE_OPTIONS + ("Review my writing",)
+}
+
+# Exercise content by type; shared between responses, so never mutated
+EXERCISE_CONTENT = {
+    ExerciseType.MULTIPLE_CHOICE: {
+        "question": "What is the correct form of the verb in this sentence?",
+        "options": ("A) is", "B) are", "C) was", "D) were"),
+        "correct_answer": "A",
+        "explanation": "The subject is singular, so we use 'is'."
+    },
+    ExerciseType.SPEAKING: {
+        "prompt": "Describe your hometown in 2 minutes.",
+        "recording_duration": 120,
+        "evaluation_criteria": ("fluency", "pronunciation", "grammar", "vocabulary")
+    },
+    ExerciseType.WRITING: {
+        "task": "Write a 150-word essay on the benefits of learning English.",
+        "time_limit": 20,
+        "word_count_target": 150
+    }
+}
+DEFAULT_EXERCISE_CONTENT = {
+    "question": "Practice question for your current focus area.",
+    "options": ("Option A", "Option B", "Option C", "Option D"),
+    "correct_answer": "A"
+}
+
+@lru_cache(maxsize=128)
+def _build_teaching_prompt(teaching_style: TeachingStyle, focus_area: str) -> str:
+    """System prompt for a teaching style and focus area, built once per pair"""
+    return (
+        "You are an expert IELTS tutor. "
+        + TEACHING_STYLE_PROMPTS.get(teaching_style, "")
+        + f" Current focus area: {focus_area}. "
+        + "Keep responses concise and actionable."
+    )
+
 class AdvancedTutorService:
     """Enhanced AI Tutor Service with advanced capabilities"""
     
     def __init__(self):
         self.openai_client = None
         self.anthropic_client = None
-        self.active_sessions: Dict[str, TutorSession] = {}
-        self.adaptive_contexts: Dict[str, AdaptiveContext] = {}
-        self.error_patterns: Dict[str, List[ErrorPattern]] = {}
-        self.teaching_style_models = {}
+        # Least recently active users are dropped once the cap is reached
+        self.adaptive_contexts: "OrderedDict[str, AdaptiveContext]" = OrderedDict()
+        self.reply_cache = SemanticResponseCache(settings.tutor_reply_cache_size, settings.tutor_reply_similarity)
         
-    async def initialize(self):
+    async def initialize(self, http_client: Optional[httpx.AsyncClient] = None):
         """Initialize the advanced tutor service"""
         logger.info("Initializing Advanced AI Tutor Service")
         
-        # Initialize AI clients
+        # Initialize AI clients; both reuse the shared keep-alive pool when one is given
         if settings.openai_api_key and settings.openai_api_key != "your-openai-api-key":
-            self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+            self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
             logger.info("OpenAI client initialized")
         
         if settings.anthropic_api_key and settings.anthropic_api_key != "your-anthropic-api-key":
-            self.anthropic_client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+            self.anthropic_client = AsyncAnthropic(api_key=settings.anthropic_api_key, http_client=http_client)
             logger.info("Anthropic client initialized")
         
-        # Initialize teaching style models
-        await self._initialize_teaching_models()
-        
         # Load adaptive contexts
         await self._load_adaptive_contexts()
         
         logger.info("Advanced AI Tutor Service initialized successfully")
     
-    async def _initialize_teaching_models(self):
-        """Initialize teaching style models"""
-        try:
-            # Initialize K-means clustering for teaching style adaptation
-            self.teaching_style_models = {
-                "engagement_clustering": KMeans(n_clusters=3, random_state=42),
-                "learning_pace_clustering": KMeans(n_clusters=3, random_state=42),
-                "error_pattern_clustering": KMeans(n_clusters=4, random_state=42)
-            }
-            logger.info("Teaching style models initialized")
-        except Exception as e:
-            logger.error("Failed to initialize teaching models", error=str(e))
-    
     async def _load_adaptive_contexts(self):
         """Load adaptive contexts for users"""
         try:
@@ -92,24 +162,29 @@ class AdvancedTutorService:
             logger.info("Processing advanced chat", user_id=user_id, mode=interaction_mode.value)
             
             # Get or create adaptive context
-            adaptive_context = await self._get_adaptive_context(user_id)
+            adaptive_context = self._get_adaptive_context(user_id)
             
-            # Analyze user input and context
-            analysis_result = await self._analyze_user_input(message, adaptive_context, interaction_mode)
+            # Analyze user input and context, lowercasing and tokenizing once for every helper
+            message_lower = message.lower()
+            tokens = WORD_PATTERN.findall(message_lower)
+            analysis_result = await self._analyze_user_input(
+                message, message_lower, tokens, adaptive_context, interaction_mode
+            )
             
             # Determine optimal teaching style
-            teaching_style = await self._determine_teaching_style(adaptive_context, analysis_result)
+            teaching_style = self._determine_teaching_style(adaptive_context, analysis_result)
+            
+            # Cached replies are keyed on the message alone, so turns that carry
+            # anything else (voice analysis, client context) always get a fresh reply
+            use_reply_cache = not context and message != VOICE_INPUT_MESSAGE
             
             # Generate multi-modal response
             response = await self._generate_multi_modal_response(
-                user_id, message, teaching_style, adaptive_context, analysis_result
+                user_id, message, teaching_style, adaptive_context, analysis_result, use_reply_cache
             )
             
             # Update adaptive context
-            await self._update_adaptive_context(user_id, adaptive_context, analysis_result, response)
-            
-            # Generate progress insights
-            insights = await self._generate_progress_insights(user_id, adaptive_context)
+            self._update_adaptive_context(user_id, adaptive_context, analysis_result, response)
             
             logger.info("Advanced chat response generated", user_id=user_id, 
                        response_type=response.response_type.value)
@@ -120,7 +195,8 @@ class AdvancedTutorService:
             logger.error("Error in advanced chat", user_id=user_id, error=str(e))
             return self._create_fallback_response(user_id, message)
     
-    async def _analyze_user_input(self, message: str, adaptive_context: AdaptiveContext, 
+    async def _analyze_user_input(self, message: str, message_lower: str, tokens: List[str],
+                                adaptive_context: AdaptiveContext, 
                                 interaction_mode: InteractionMode) -> Dict[str, Any]:
         """Analyze user input for patterns and context"""
         try:
@@ -133,27 +209,20 @@ class AdvancedTutorService:
                 "attention_signals": []
             }
             
-            # Analyze sentiment and complexity
-            if self.openai_client:
-                response = await self.openai_client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "Analyze the user's message for sentiment, complexity, and learning indicators."},
-                        {"role": "user", "content": f"Analyze: {message}"}
-                    ],
-                    max_tokens=100
-                )
-                
-                # Parse analysis (simplified for demo)
-                analysis["sentiment"] = "positive" if any(word in message.lower() for word in ["good", "great", "excellent"]) else "neutral"
-                analysis["complexity"] = "high" if len(message.split()) > 20 else "medium"
+            # Sentiment and complexity from keywords and length; no model call needed
+            if not POSITIVE_WORDS.isdisjoint(tokens):
+                analysis["sentiment"] = "positive"
+            elif not NEGATIVE_WORDS.isdisjoint(tokens):
+                analysis["sentiment"] = "negative"
+            if len(tokens) > 20:
+                analysis["complexity"] = "high"
             
             # Detect error patterns
-            error_patterns = await self._detect_error_patterns(message, adaptive_context)
+            error_patterns = self._detect_error_patterns(message, message_lower, adaptive_context)
             analysis["error_patterns"] = error_patterns
             
             # Analyze learning indicators
-            learning_indicators = await self._analyze_learning_indicators(message, adaptive_context)
+            learning_indicators = self._analyze_learning_indicators(message, message_lower, adaptive_context)
             analysis["learning_indicators"] = learning_indicators
             
             return analysis
@@ -162,46 +231,44 @@ class AdvancedTutorService:
             logger.error("Error analyzing user input", error=str(e))
             return {"sentiment": "neutral", "complexity": "medium", "engagement_level": 0.5}
     
-    async def _determine_teaching_style(self, adaptive_context: AdaptiveContext, 
-                                      analysis_result: Dict[str, Any]) -> TeachingStyle:
+    def _determine_teaching_style(self, adaptive_context: AdaptiveContext, 
+                                analysis_result: Dict[str, Any]) -> TeachingStyle:
         """Determine optimal teaching style based on user context and analysis"""
-        try:
-            # Get current engagement level
-            engagement = analysis_result.get("engagement_level", 0.5)
-            
-            # Get error patterns
-            error_count = len(analysis_result.get("error_patterns", []))
-            
-            # Determine teaching style based on engagement and errors
-            if engagement < 0.3:
-                return TeachingStyle.SUPPORTIVE
-            elif error_count > 3:
-                return TeachingStyle.STRUCTURED
-            elif engagement > 0.8:
-                return TeachingStyle.CHALLENGING
-            elif adaptive_context.learning_pace == "fast":
-                return TeachingStyle.EXPLORATORY
-            else:
-                return TeachingStyle.CONVERSATIONAL
-                
-        except Exception as e:
-            logger.error("Error determining teaching style", error=str(e))
+        # Get current engagement level
+        engagement = analysis_result.get("engagement_level", 0.5)
+        
+        # Get error patterns
+        error_count = len(analysis_result.get("error_patterns", []))
+        
+        # Determine teaching style based on engagement and errors
+        if engagement < 0.3:
+            return TeachingStyle.SUPPORTIVE
+        elif error_count > 3:
+            return TeachingStyle.STRUCTURED
+        elif engagement > 0.8:
+            return TeachingStyle.CHALLENGING
+        elif adaptive_context.learning_pace == "fast":
+            return TeachingStyle.EXPLORATORY
+        else:
             return TeachingStyle.CONVERSATIONAL
     
     async def _generate_multi_modal_response(self, user_id: str, message: str, 
                                            teaching_style: TeachingStyle,
                                            adaptive_context: AdaptiveContext,
-                                           analysis_result: Dict[str, Any]) -> MultiModalResponse:
+                                           analysis_result: Dict[str, Any],
+                                           use_reply_cache: bool = True) -> MultiModalResponse:
         """Generate multi-modal response based on teaching style and context"""
         try:
             # Generate base text response
-            text_response = await self._generate_text_response(message, teaching_style, adaptive_context)
+            text_response = await self._generate_text_response(
+                message, teaching_style, adaptive_context, use_reply_cache
+            )
             
             # Determine response type based on context
-            response_type = await self._determine_response_type(adaptive_context, analysis_result)
+            response_type = self._determine_response_type(adaptive_context, analysis_result)
             
             # Generate content based on response type
-            content = await self._generate_response_content(
+            content = self._generate_response_content(
                 response_type, text_response, teaching_style, adaptive_context
             )
             
@@ -212,7 +279,7 @@ class AdvancedTutorService:
                 confidence=0.85,
                 teaching_style=teaching_style,
                 adaptive_context=adaptive_context,
-                follow_up_actions=await self._generate_follow_up_actions(adaptive_context, analysis_result)
+                follow_up_actions=self._generate_follow_up_actions(adaptive_context, analysis_result)
             )
             
             return response
@@ -222,12 +289,28 @@ class AdvancedTutorService:
             return self._create_fallback_response(user_id, message)
     
     async def _generate_text_response(self, message: str, teaching_style: TeachingStyle,
-                                    adaptive_context: AdaptiveContext) -> str:
+                                    adaptive_context: AdaptiveContext,
+                                    use_reply_cache: bool = True) -> str:
         """Generate text response using AI models"""
         try:
             if self.openai_client:
+                # The prompt depends only on style and focus, so replies are shared across users
+                bucket_key = (teaching_style, adaptive_context.current_focus_area)
+                normalized = normalize_message(message)
+                embedding = None
+                if use_reply_cache:
+                    cached = self.reply_cache.get_exact(bucket_key, normalized)
+                    if cached is not None:
+                        return cached
+                    
+                    embedding = await self._embed_message(normalized)
+                    if embedding is not None:
+                        cached = self.reply_cache.get_similar(bucket_key, embedding)
+                        if cached is not None:
+                            return cached
+                
                 # Create context-aware prompt
-                prompt = self._create_teaching_prompt(message, teaching_style, adaptive_context)
+                prompt = _build_teaching_prompt(teaching_style, adaptive_context.current_focus_area)
                 
                 response = await self.openai_client.chat.completions.create(
                     model="gpt-3.5-turbo",
@@ -238,7 +321,10 @@ class AdvancedTutorService:
                     max_tokens=300
                 )
                 
-                return response.choices[0].message.content
+                text = response.choices[0].message.content
+                if use_reply_cache:
+                    self.reply_cache.put(bucket_key, normalized, embedding, text)
+                return text
             else:
                 # Fallback response
                 return f"I understand you said: '{message}'. Let me help you with that."
@@ -247,60 +333,44 @@ class AdvancedTutorService:
             logger.error("Error generating text response", error=str(e))
             return "I'm here to help you with your IELTS preparation. Could you please rephrase your question?"
     
-    def _create_teaching_prompt(self, message: str, teaching_style: TeachingStyle,
-                               adaptive_context: AdaptiveContext) -> str:
-        """Create context-aware teaching prompt"""
-        base_prompt = "You are an expert IELTS tutor. "
+    async def _embed_message(self, normalized: str) -> Optional[np.ndarray]:
+        """Unit-length embedding of a normalized message, or None if the call fails"""
+        try:
+            result = await self.openai_client.embeddings.create(
+                model=settings.embedding_model,
+                input=normalized
+            )
+            return unit_vector(result.data[0].embedding)
+        except Exception as e:
+            logger.warning("Message embedding failed, skipping reply cache", error=str(e))
+            return None
+    
+    def _determine_response_type(self, adaptive_context: AdaptiveContext,
+                               analysis_result: Dict[str, Any]) -> ResponseType:
+        """Determine the type of response to generate"""
+        # Check if user prefers voice interaction
+        if adaptive_context.preferred_interaction_mode == InteractionMode.VOICE:
+            return ResponseType.AUDIO
         
-        if teaching_style == TeachingStyle.SUPPORTIVE:
-            base_prompt += "Be encouraging and supportive. Focus on building confidence."
-        elif teaching_style == TeachingStyle.STRUCTURED:
-            base_prompt += "Provide clear, structured explanations with step-by-step guidance."
-        elif teaching_style == TeachingStyle.CHALLENGING:
-            base_prompt += "Challenge the student with advanced concepts and encourage critical thinking."
-        elif teaching_style == TeachingStyle.EXPLORATORY:
-            base_prompt += "Encourage exploration and discovery. Ask probing questions."
-        elif teaching_style == TeachingStyle.CONVERSATIONAL:
-            base_prompt += "Maintain a natural conversation flow while providing educational value."
-        elif teaching_style == TeachingStyle.GAMIFIED:
-            base_prompt += "Make learning fun and engaging with gamified elements."
+        # Check if we should provide an interactive exercise
+        if len(analysis_result.get("error_patterns", [])) > 2:
+            return ResponseType.EXERCISE
         
-        base_prompt += f" Current focus area: {adaptive_context.current_focus_area}. "
-        base_prompt += "Keep responses concise and actionable."
+        # Check if we should provide visual content
+        if adaptive_context.attention_span < 5:  # Short attention span
+            return ResponseType.VISUAL
         
-        return base_prompt
-    
-    async def _determine_response_type(self, adaptive_context: AdaptiveContext,
-                                     analysis_result: Dict[str, Any]) -> ResponseType:
-        """Determine the type of response to generate"""
-        try:
-            # Check if user prefers voice interaction
-            if adaptive_context.preferred_interaction_mode == InteractionMode.VOICE:
-                return ResponseType.AUDIO
-            
-            # Check if we should provide an interactive exercise
-            if len(analysis_result.get("error_patterns", [])) > 2:
-                return ResponseType.EXERCISE
-            
-            # Check if we should provide visual content
-            if adaptive_context.attention_span < 5:  # Short attention span
-                return ResponseType.VISUAL
-            
-            # Default to text with potential for interactive elements
-            return ResponseType.INTERACTIVE
-            
-        except Exception as e:
-            logger.error("Error determining response type", error=str(e))
-            return ResponseType.TEXT
+        # Default to text with potential for interactive elements
+        return ResponseType.INTERACTIVE
     
-    async def _generate_response_content(self, response_type: ResponseType, 
-                                       text_response: str, teaching_style: TeachingStyle,
-                                       adaptive_context: AdaptiveContext) -> Dict[str, Any]:
+    def _generate_response_content(self, response_type: ResponseType, 
+                                 text_response: str, teaching_style: TeachingStyle,
+                                 adaptive_context: AdaptiveContext) -> Dict[str, Any]:
         """Generate content based on response type"""
         try:
             content = {
                 "text": text_response,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": iso_utc_now()
             }
             
             if response_type == ResponseType.AUDIO:
@@ -321,13 +391,13 @@ class AdvancedTutorService:
                 }
             
             elif response_type == ResponseType.EXERCISE:
-                exercise = await self._generate_interactive_exercise(adaptive_context)
+                exercise = self._generate_interactive_exercise(adaptive_context)
                 content["exercise"] = exercise.dict()
             
             elif response_type == ResponseType.INTERACTIVE:
                 content["interactive"] = {
                     "type": "chat_with_options",
-                    "options": await self._generate_response_options(adaptive_context),
+                    "options": self._generate_response_options(adaptive_context),
                     "quick_actions": ["Practice", "Review", "Ask Question"]
                 }
             
@@ -335,9 +405,9 @@ class AdvancedTutorService:
             
         except Exception as e:
             logger.error("Error generating response content", error=str(e))
-            return {"text": text_response, "timestamp": datetime.utcnow().isoformat()}
+            return {"text": text_response, "timestamp": iso_utc_now()}
     
-    async def _generate_interactive_exercise(self, adaptive_context: AdaptiveContext) -> InteractiveExercise:
+    def _generate_interactive_exercise(self, adaptive_context: AdaptiveContext) -> InteractiveExercise:
         """Generate interactive exercise based on user context"""
         try:
             # Determine exercise type based on focus area
@@ -352,7 +422,7 @@ class AdvancedTutorService:
                 exercise_type = ExerciseType.READING
             
             # Generate exercise content
-            exercise_content = await self._generate_exercise_content(exercise_type, adaptive_context)
+            exercise_content = self._generate_exercise_content(exercise_type, adaptive_context)
             
             exercise = InteractiveExercise(
                 exercise_type=exercise_type,
@@ -372,198 +442,120 @@ class AdvancedTutorService:
             logger.error("Error generating interactive exercise", error=str(e))
             return self._create_fallback_exercise()
     
-    async def _generate_exercise_content(self, exercise_type: ExerciseType,
-                                       adaptive_context: AdaptiveContext) -> Dict[str, Any]:
+    def _generate_exercise_content(self, exercise_type: ExerciseType,
+                                   adaptive_context: AdaptiveContext) -> Dict[str, Any]:
         """Generate exercise content based on type"""
-        try:
-            if exercise_type == ExerciseType.MULTIPLE_CHOICE:
-                return {
-                    "question": "What is the correct form of the verb in this sentence?",
-                    "options": ["A) is", "B) are", "C) was", "D) were"],
-                    "correct_answer": "A",
-                    "explanation": "The subject is singular, so we use 'is'."
-                }
-            elif exercise_type == ExerciseType.SPEAKING:
-                return {
-                    "prompt": "Describe your hometown in 2 minutes.",
-                    "recording_duration": 120,
-                    "evaluation_criteria": ["fluency", "pronunciation", "grammar", "vocabulary"]
-                }
-            elif exercise_type == ExerciseType.WRITING:
-                return {
-                    "task": "Write a 150-word essay on the benefits of learning English.",
-                    "time_limit": 20,
-                    "word_count_target": 150
-                }
-            else:
-                return {
-                    "question": "Practice question for your current focus area.",
-                    "options": ["Option A", "Option B", "Option C", "Option D"],
-                    "correct_answer": "A"
-                }
-                
-        except Exception as e:
-            logger.error("Error generating exercise content", error=str(e))
-            return {"question": "Default practice question", "options": ["A", "B", "C", "D"]}
+        return EXERCISE_CONTENT.get(exercise_type, DEFAULT_EXERCISE_CONTENT)
     
-    async def _generate_response_options(self, adaptive_context: AdaptiveContext) -> List[str]:
+    def _generate_response_options(self, adaptive_context: AdaptiveContext) -> Tuple[str, ...]:
         """Generate response options for interactive chat"""
-        try:
-            options = [
-                "I need more practice",
-                "Can you explain this further?",
-                "Show me an example",
-                "I'm ready for the next topic"
-            ]
-            
-            # Customize based on user's current focus area
-            if adaptive_context.current_focus_area == "speaking":
-                options.append("Practice pronunciation")
-            elif adaptive_context.current_focus_area == "writing":
-                options.append("Review my writing")
-            
-            return options
-            
-        except Exception as e:
-            logger.error("Error generating response options", error=str(e))
-            return ["Continue", "Ask question", "Practice more"]
+        return RESPONSE_OPTIONS.get(adaptive_context.current_focus_area, BASE_RESPONSE_OPTIONS)
     
-    async def _generate_follow_up_actions(self, adaptive_context: AdaptiveContext,
-                                        analysis_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_follow_up_actions(self, adaptive_context: AdaptiveContext,
+                                  analysis_result: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate follow-up actions based on context and analysis"""
-        try:
-            actions = []
-            
-            # Add practice action if errors detected
-            if len(analysis_result.get("error_patterns", [])) > 0:
-                actions.append({
-                    "type": "practice",
-                    "title": "Practice this concept",
-                    "description": "Let's practice to improve your understanding",
-                    "priority": "high"
-                })
-            
-            # Add review action if engagement is low
-            if analysis_result.get("engagement_level", 0.5) < 0.4:
-                actions.append({
-                    "type": "review",
-                    "title": "Review previous material",
-                    "description": "Let's review what we covered earlier",
-                    "priority": "medium"
-                })
-            
-            # Add challenge action if user is doing well
-            if analysis_result.get("engagement_level", 0.5) > 0.8:
-                actions.append({
-                    "type": "challenge",
-                    "title": "Try a more challenging exercise",
-                    "description": "You're doing great! Let's try something harder",
-                    "priority": "medium"
-                })
-            
-            return actions
-            
-        except Exception as e:
-            logger.error("Error generating follow-up actions", error=str(e))
-            return []
+        actions = []
+        
+        # Add practice action if errors detected
+        if len(analysis_result.get("error_patterns", [])) > 0:
+            actions.append({
+                "type": "practice",
+                "title": "Practice this concept",
+                "description": "Let's practice to improve your understanding",
+                "priority": "high"
+            })
+        
+        # Add review action if engagement is low
+        if analysis_result.get("engagement_level", 0.5) < 0.4:
+            actions.append({
+                "type": "review",
+                "title": "Review previous material",
+                "description": "Let's review what we covered earlier",
+                "priority": "medium"
+            })
+        
+        # Add challenge action if user is doing well
+        if analysis_result.get("engagement_level", 0.5) > 0.8:
+            actions.append({
+                "type": "challenge",
+                "title": "Try a more challenging exercise",
+                "description": "You're doing great! Let's try something harder",
+                "priority": "medium"
+            })
+        
+        return actions
     
-    async def _detect_error_patterns(self, message: str, adaptive_context: AdaptiveContext) -> List[ErrorPattern]:
+    def _detect_error_patterns(self, message: str, message_lower: str,
+                               adaptive_context: AdaptiveContext) -> List[ErrorPattern]:
         """Detect error patterns in user input"""
-        try:
-            patterns = []
-            
-            # Simple error detection (in production, use more sophisticated NLP)
-            common_errors = {
-                "grammar": ["I is", "you was", "they has"],
-                "vocabulary": ["very good", "very bad", "very nice"],
-                "pronunciation": ["tink", "dat", "wut"]
-            }
-            
-            message_lower = message.lower()
-            
-            for error_type, error_phrases in common_errors.items():
-                for phrase in error_phrases:
-                    if phrase in message_lower:
-                        patterns.append(ErrorPattern(
-                            error_type=error_type,
-                            frequency=1,
-                            context={"phrase": phrase, "message": message},
-                            severity="medium",
-                            suggested_interventions=[f"Practice {error_type} rules"]
-                        ))
-            
-            return patterns
-            
-        except Exception as e:
-            logger.error("Error detecting error patterns", error=str(e))
-            return []
+        patterns = []
+        seen = set()
+        
+        for _, (error_type, phrase) in ERROR_AUTOMATON.iter(message_lower):
+            if phrase in seen:
+                continue
+            seen.add(phrase)
+            patterns.append(ErrorPattern(
+                error_type=error_type,
+                frequency=1,
+                context={"phrase": phrase, "message": message},
+                severity="medium",
+                suggested_interventions=[f"Practice {error_type} rules"]
+            ))
+        
+        return patterns
     
-    async def _analyze_learning_indicators(self, message: str, adaptive_context: AdaptiveContext) -> List[Dict[str, Any]]:
+    def _analyze_learning_indicators(self, message: str, message_lower: str,
+                                     adaptive_context: AdaptiveContext) -> List[Dict[str, Any]]:
         """Analyze learning indicators in user input"""
-        try:
-            indicators = []
-            
-            # Check for learning-related keywords
-            learning_keywords = ["learn", "practice", "understand", "improve", "help"]
-            message_lower = message.lower()
-            
-            for keyword in learning_keywords:
-                if keyword in message_lower:
-                    indicators.append({
-                        "type": "learning_intent",
-                        "keyword": keyword,
-                        "confidence": 0.8
-                    })
-            
-            # Check for question patterns
-            if "?" in message:
+        indicators = []
+        
+        # Check for learning-related keywords
+        learning_keywords = ["learn", "practice", "understand", "improve", "help"]
+        
+        for keyword in learning_keywords:
+            if keyword in message_lower:
                 indicators.append({
-                    "type": "question",
-                    "confidence": 0.9
+                    "type": "learning_intent",
+                    "keyword": keyword,
+                    "confidence": 0.8
                 })
-            
-            return indicators
-            
-        except Exception as e:
-            logger.error("Error analyzing learning indicators", error=str(e))
-            return []
+        
+        # Check for question patterns
+        if "?" in message:
+            indicators.append({
+                "type": "question",
+                "confidence": 0.9
+            })
+        
+        return indicators
     
-    async def _get_adaptive_context(self, user_id: str) -> AdaptiveContext:
+    def _get_adaptive_context(self, user_id: str) -> AdaptiveContext:
         """Get or create adaptive context for user"""
-        try:
-            if user_id in self.adaptive_contexts:
-                return self.adaptive_contexts[user_id]
-            
-            # Create new adaptive context
-            context = AdaptiveContext(
-                user_id=user_id,
-                current_teaching_style=TeachingStyle.CONVERSATIONAL,
-                preferred_interaction_mode=InteractionMode.TEXT,
-                learning_pace="normal",
-                attention_span=15,
-                current_focus_area="general",
-                session_duration=0,
-                engagement_level=0.5
-            )
-            
-            self.adaptive_contexts[user_id] = context
+        context = self.adaptive_contexts.get(user_id)
+        if context is not None:
+            self.adaptive_contexts.move_to_end(user_id)
             return context
-            
-        except Exception as e:
-            logger.error("Error getting adaptive context", error=str(e))
-            return AdaptiveContext(
-                user_id=user_id,
-                current_teaching_style=TeachingStyle.CONVERSATIONAL,
-                preferred_interaction_mode=InteractionMode.TEXT,
-                learning_pace="normal",
-                attention_span=15,
-                current_focus_area="general",
-                session_duration=0,
-                engagement_level=0.5
-            )
+        
+        # Create new adaptive context
+        context = AdaptiveContext(
+            user_id=user_id,
+            current_teaching_style=TeachingStyle.CONVERSATIONAL,
+            preferred_interaction_mode=InteractionMode.TEXT,
+            learning_pace="normal",
+            attention_span=15,
+            current_focus_area="general",
+            session_duration=0,
+            engagement_level=0.5
+        )
+        
+        self.adaptive_contexts[user_id] = context
+        if len(self.adaptive_contexts) > settings.adaptive_context_cache_size:
+            self.adaptive_contexts.popitem(last=False)
+        return context
     
-    async def _update_adaptive_context(self, user_id: str, adaptive_context: AdaptiveContext,
-                                     analysis_result: Dict[str, Any], response: MultiModalResponse):
+    def _update_adaptive_context(self, user_id: str, adaptive_context: AdaptiveContext,
+                               analysis_result: Dict[str, Any], response: MultiModalResponse):
         """Update adaptive context based on interaction"""
         try:
             # Update engagement level
@@ -572,6 +564,8 @@ class AdvancedTutorService:
             # Update error patterns
             new_errors = analysis_result.get("error_patterns", [])
             adaptive_context.error_patterns.extend(new_errors)
+            if len(adaptive_context.error_patterns) > MAX_ERROR_HISTORY:
+                del adaptive_context.error_patterns[:-MAX_ERROR_HISTORY]
             
             # Update session duration
             adaptive_context.session_duration += 1
@@ -583,12 +577,10 @@ class AdvancedTutorService:
             if response.teaching_style != adaptive_context.current_teaching_style:
                 adaptive_context.current_teaching_style = response.teaching_style
             
-            self.adaptive_contexts[user_id] = adaptive_context
-            
         except Exception as e:
             logger.error("Error updating adaptive context", error=str(e))
     
-    async def _generate_progress_insights(self, user_id: str, adaptive_context: AdaptiveContext) -> List[ProgressInsight]:
+    def _generate_progress_insights(self, user_id: str, adaptive_context: AdaptiveContext) -> List[ProgressInsight]:
         """Generate progress insights for user"""
         try:
             insights = []
@@ -631,7 +623,7 @@ class AdvancedTutorService:
             response_type=ResponseType.TEXT,
             content={
                 "text": "I'm here to help you with your IELTS preparation. Could you please rephrase your question?",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": iso_utc_now()
             },
             confidence=0.5,
             teaching_style=TeachingStyle.SUPPORTIVE
@@ -16,12 +16,14 @@ class LearningPathService:
     """Service for generating personalized learning paths"""
     
     def __init__(self):
+        self.http_client: Optional[httpx.AsyncClient] = None
         self.path_templates: Dict[str, List[Dict[str, Any]]] = {}
         self.content_database: Dict[str, List[Dict[str, Any]]] = {}
         
-    async def initialize(self):
+    async def initialize(self, http_client: Optional[httpx.AsyncClient] = None):
         """Initialize the learning path service"""
         logger.info("Initializing Learning Path Service")
+        self.http_client = http_client or httpx.AsyncClient()
         
         # Load path templates and content database
         await self._load_path_templates()
@@ -440,14 +442,13 @@ class LearningPathService:
     async def _get_user_progress(self, user_id: str) -> Optional[UserProgress]:
         """Get user progress from external service"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.api_service_url}/api/v1/users/{user_id}/progress",
-                    timeout=5.0
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return UserProgress(**data)
+            response = await self.http_client.get(
+                f"{settings.api_service_url}/api/v1/users/{user_id}/progress",
+                timeout=5.0
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return UserProgress(**data)
         except Exception as e:
             logger.warning("Could not fetch user progress", user_id=user_id, error=str(e))
         
@@ -456,14 +457,13 @@ class LearningPathService:
     async def _get_learning_analytics(self, user_id: str) -> Optional[LearningAnalytics]:
         """Get learning analytics from external service"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.analytics_service_url}/api/v1/analytics/{user_id}",
-                    timeout=5.0
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return LearningAnalytics(**data)
+            response = await self.http_client.get(
+                f"{settings.analytics_service_url}/api/v1/analytics/{user_id}",
+                timeout=5.0
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return LearningAnalytics(**data)
         except Exception as e:
             logger.warning("Could not fetch learning analytics", user_id=user_id, error=str(e))
         
@@ -523,6 +523,7 @@ class LearningPathService:
         
         return {
             "id": f"fallback_path_{user_id}",
+            "fallback": True,
             "user_id": user_id,
             "path_name": f"Standard Path to {target_score}",
             "target_score": target_score,
@@ -2,6 +2,7 @@ import structlog
 import httpx
 import json
 import asyncio
+import numpy as np
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import random
@@ -12,19 +13,33 @@ from models.tutor import UserProgress
 
 logger = structlog.get_logger()
 
+# Categorical catalog columns stored as int8 codes instead of strings
+CATEGORICAL_COLUMNS = ("module", "type", "difficulty")
+
+def is_complete_daily(daily_recommendations: Dict[str, Any]) -> bool:
+    """False when daily recommendations fell back, as a whole or for any module"""
+    return not daily_recommendations.get("fallback") and not any(
+        rec.get("fallback") for rec in daily_recommendations.get("recommendations", [])
+    )
+
 class RecommendationService:
     """Service for generating personalized learning recommendations"""
     
     def __init__(self):
+        self.http_client: Optional[httpx.AsyncClient] = None
         self.recommendation_cache: Dict[str, List[Recommendation]] = {}
         self.content_database: Dict[str, List[Dict[str, Any]]] = {}
+        self.content_index: Dict[str, Dict[str, np.ndarray]] = {}  # module -> column arrays
+        self.vocabularies: Dict[str, Dict[str, int]] = {}  # column -> value -> code
         
-    async def initialize(self):
+    async def initialize(self, http_client: Optional[httpx.AsyncClient] = None):
         """Initialize the recommendation service"""
         logger.info("Initializing Recommendation Service")
+        self.http_client = http_client or httpx.AsyncClient()
         
         # Load content database
         await self._load_content_database()
+        self._build_content_index()
         
         # Initialize cache
         self.recommendation_cache = {}
@@ -179,65 +194,63 @@ class RecommendationService:
         # Get content for the module
         content_list = self.content_database.get(module or "general", [])
         
-        # Filter and rank content
-        for content in content_list:
-            if len(recommendations) >= limit:
-                break
-                
-            # Calculate recommendation score
-            score = self._calculate_recommendation_score(
-                content, user_progress, learning_analytics, weak_areas
-            )
-            
-            if score > 0.5:  # Only recommend if score is above threshold
-                recommendation = Recommendation(
-                    user_id=user_id,
-                    recommendation_type=self._determine_recommendation_type(content, user_progress),
-                    title=content["title"],
-                    description=content["description"],
-                    content_type=ContentType(content["type"]),
-                    difficulty=DifficultyLevel(content["difficulty"]),
-                    priority=self._calculate_priority(content, weak_areas),
-                    reasoning=self._generate_reasoning(content, weak_areas, user_progress),
-                    expected_benefit=content.get("expected_benefit", "Improve overall skills"),
-                    estimated_time=content.get("duration", 30),
-                    tags=content.get("tags", [])
-                )
-                recommendations.append(recommendation)
-        
-        # Sort by priority and score
-        recommendations.sort(key=lambda x: (x.priority, self._calculate_recommendation_score(
-            {"title": x.title, "difficulty": x.difficulty.value}, user_progress, learning_analytics, weak_areas
-        )), reverse=True)
-        
-        return recommendations[:limit]
+        # Score and rank the whole module at once over its column arrays
+        index = self.content_index.get(module or "general")
+        if index is None:
+            return recommendations
+        
+        scores = self._score_content(index, user_progress, learning_analytics, weak_areas)
+        priorities = self._content_priorities(index, weak_areas)
+        
+        # Only recommend if score is above threshold
+        eligible = np.flatnonzero(scores > 0.5)
+        # Highest priority (lowest value, 1 = weak area) first, then highest score
+        ranked = eligible[np.lexsort((-scores[eligible], priorities[eligible]))]
+        top_candidates = [(int(priorities[i]), content_list[i]) for i in ranked[:limit]]
+        
+        # Only build models for the recommendations actually returned
+        for priority, content in top_candidates:
+            recommendations.append(Recommendation(
+                user_id=user_id,
+                recommendation_type=self._determine_recommendation_type(content, user_progress),
+                title=content["title"],
+                description=content["description"],
+                content_type=ContentType(content["type"]),
+                difficulty=DifficultyLevel(content["difficulty"]),
+                priority=priority,
+                reasoning=self._generate_reasoning(content, weak_areas, user_progress),
+                expected_benefit=content.get("expected_benefit", "Improve overall skills"),
+                estimated_time=content.get("duration", 30),
+                tags=content.get("tags", [])
+            ))
+        
+        return recommendations
     
-    def _calculate_recommendation_score(self, content: Dict[str, Any], 
-                                      user_progress: Optional[UserProgress],
-                                      learning_analytics: Optional[LearningAnalytics],
-                                      weak_areas: List[str]) -> float:
-        """Calculate recommendation score based on user needs"""
-        score = 0.5  # Base score
+    def _score_content(self, index: Dict[str, np.ndarray],
+                       user_progress: Optional[UserProgress],
+                       learning_analytics: Optional[LearningAnalytics],
+                       weak_areas: List[str]) -> np.ndarray:
+        """Calculate recommendation scores for every item in a module index"""
+        scores = np.full(len(index["id"]), 0.5)  # Base score
         
         # Boost score if content addresses weak areas
-        if content.get("module") in weak_areas:
-            score += 0.3
+        scores += 0.3 * np.isin(index["module"], self._codes("module", weak_areas))
         
         # Boost score based on user progress
         if user_progress:
-            if content.get("difficulty") == user_progress.current_level:
-                score += 0.2
-            elif content.get("difficulty") == user_progress.target_level:
-                score += 0.1
+            scores += np.where(
+                index["difficulty"] == self._code("difficulty", user_progress.current_level), 0.2,
+                np.where(index["difficulty"] == self._code("difficulty", user_progress.target_level), 0.1, 0.0)
+            )
         
         # Boost score based on learning analytics
         if learning_analytics:
-            if learning_analytics.accuracy_rate < 70 and content.get("type") == "practice":
-                score += 0.2
-            if learning_analytics.study_time < 60 and content.get("duration", 0) < 30:
-                score += 0.1
+            if learning_analytics.accuracy_rate < 70:
+                scores += 0.2 * (index["type"] == self._code("type", "practice"))
+            if learning_analytics.study_time < 60:
+                scores += 0.1 * (index["duration"] < 30)
         
-        return min(score, 1.0)
+        return np.minimum(scores, 1.0)
     
     def _determine_recommendation_type(self, content: Dict[str, Any], 
                                      user_progress: Optional[UserProgress]) -> str:
@@ -253,16 +266,17 @@ class RecommendationService:
         else:
             return "challenge"
     
-    def _calculate_priority(self, content: Dict[str, Any], weak_areas: List[str]) -> int:
-        """Calculate recommendation priority (1 = highest)"""
-        if content.get("module") in weak_areas:
-            return 1
-        elif content.get("type") in ["practice", "quiz"]:
-            return 2
-        elif content.get("type") in ["lesson", "video"]:
-            return 3
-        else:
-            return 4
+    def _content_priorities(self, index: Dict[str, np.ndarray], weak_areas: List[str]) -> np.ndarray:
+        """Calculate recommendation priorities (1 = highest) for every item in a module index"""
+        return np.select(
+            [
+                np.isin(index["module"], self._codes("module", weak_areas)),
+                np.isin(index["type"], self._codes("type", ["practice", "quiz"])),
+                np.isin(index["type"], self._codes("type", ["lesson", "video"]))
+            ],
+            [1, 2, 3],
+            default=4
+        )
     
     def _generate_reasoning(self, content: Dict[str, Any], weak_areas: List[str],
                           user_progress: Optional[UserProgress]) -> str:
@@ -418,14 +432,13 @@ class RecommendationService:
     async def _get_user_progress(self, user_id: str) -> Optional[UserProgress]:
         """Get user progress from external service"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.api_service_url}/api/v1/users/{user_id}/progress",
-                    timeout=5.0
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return UserProgress(**data)
+            response = await self.http_client.get(
+                f"{settings.api_service_url}/api/v1/users/{user_id}/progress",
+                timeout=5.0
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return UserProgress(**data)
         except Exception as e:
             logger.warning("Could not fetch user progress", user_id=user_id, error=str(e))
         
@@ -434,14 +447,13 @@ class RecommendationService:
     async def _get_learning_analytics(self, user_id: str) -> Optional[LearningAnalytics]:
         """Get learning analytics from external service"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.analytics_service_url}/api/v1/analytics/{user_id}",
-                    timeout=5.0
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return LearningAnalytics(**data)
+            response = await self.http_client.get(
+                f"{settings.analytics_service_url}/api/v1/analytics/{user_id}",
+                timeout=5.0
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return LearningAnalytics(**data)
         except Exception as e:
             logger.warning("Could not fetch learning analytics", user_id=user_id, error=str(e))
         
@@ -546,6 +558,32 @@ class RecommendationService:
             ]
         }
     
+    def _build_content_index(self):
+        """Lay each module's catalog out as compact column arrays for vectorized scoring"""
+        all_content = [content for content_list in self.content_database.values() for content in content_list]
+        self.vocabularies = {
+            column: {value: code for code, value in enumerate(sorted({content.get(column, "") for content in all_content}))}
+            for column in CATEGORICAL_COLUMNS
+        }
+        
+        self.content_index = {}
+        for module, content_list in self.content_database.items():
+            index = {"id": np.array([content["id"] for content in content_list])}
+            for column in CATEGORICAL_COLUMNS:
+                vocabulary = self.vocabularies[column]
+                index[column] = np.array([vocabulary[content.get(column, "")] for content in content_list], dtype=np.int8)
+            index["duration"] = np.array([content.get("duration", 0) for content in content_list], dtype=np.int16)
+            self.content_index[module] = index
+    
+    def _code(self, column: str, value: Optional[str]) -> int:
+        """Code for a categorical value, or -1 if no content uses it"""
+        return self.vocabularies[column].get(value, -1)
+    
+    def _codes(self, column: str, values: List[str]) -> List[int]:
+        """Codes for the categorical values that appear in the catalog"""
+        vocabulary = self.vocabularies[column]
+        return [vocabulary[value] for value in values if value in vocabulary]
+    
     def _is_cache_valid(self, recommendations: List[Recommendation]) -> bool:
         """Check if cached recommendations are still valid"""
         if not recommendations:
@@ -576,7 +614,8 @@ class RecommendationService:
                 "estimated_time": 30,
                 "tags": ["practice", "general"],
                 "created_date": datetime.utcnow().isoformat(),
-                "is_completed": False
+                "is_completed": False,
+                "fallback": True
             })
         
         return fallback_recs
@@ -586,6 +625,7 @@ class RecommendationService:
         return {
             "date": datetime.utcnow().date().isoformat(),
             "user_id": user_id,
+            "fallback": True,
             "recommendations": self._get_fallback_recommendations(None, 4),
             "study_plan": {
                 "total_time": 60,
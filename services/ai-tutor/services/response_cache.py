@@ -0,0 +1,92 @@
+import re
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """Lower-case a message and collapse its whitespace for exact-repeat lookups"""
+    return WHITESPACE_PATTERN.sub(" ", message.strip().lower())
+
+
+class _Bucket:
+    """Stacked embeddings and responses for one (teaching style, focus area) pair"""
+
+    __slots__ = ("vectors", "responses", "last_used", "size")
+
+    def __init__(self, capacity: int, dim: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.responses: List[str] = [""] * capacity
+        self.last_used = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+
+
+class SemanticResponseCache:
+    """Tutor replies keyed by prompt bucket and message meaning.
+
+    Exact repeats of a normalized message are answered from a dict without
+    embedding. Otherwise the message embedding is compared with every cached
+    embedding in its bucket in one matrix-vector product, and the closest
+    reply is reused when its cosine similarity clears the threshold. Each
+    bucket holds at most ``capacity`` replies and evicts the least recently used.
+    """
+
+    def __init__(self, capacity: int, threshold: float):
+        self.capacity = capacity
+        self.threshold = threshold
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        self._exact: "OrderedDict[tuple, str]" = OrderedDict()
+        self._clock = 0
+
+    def get_exact(self, bucket_key: Hashable, normalized: str) -> Optional[str]:
+        """Reply cached for this exact normalized message, if any"""
+        key = (bucket_key, normalized)
+        response = self._exact.get(key)
+        if response is not None:
+            self._exact.move_to_end(key)
+        return response
+
+    def get_similar(self, bucket_key: Hashable, embedding: np.ndarray) -> Optional[str]:
+        """Reply cached for the closest message in the bucket, if close enough"""
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None or bucket.size == 0:
+            return None
+        similarities = bucket.vectors[:bucket.size] @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        self._clock += 1
+        bucket.last_used[best] = self._clock
+        return bucket.responses[best]
+
+    def put(self, bucket_key: Hashable, normalized: str, embedding: Optional[np.ndarray], response: str):
+        """Cache a reply under its normalized message and, when available, its embedding"""
+        self._exact[(bucket_key, normalized)] = response
+        # Exact entries get the same overall budget as the embedding buckets
+        if len(self._exact) > self.capacity * max(len(self._buckets), 1):
+            self._exact.popitem(last=False)
+
+        if embedding is None:
+            return
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            bucket = self._buckets[bucket_key] = _Bucket(self.capacity, embedding.shape[0])
+        if bucket.size < self.capacity:
+            slot = bucket.size
+            bucket.size += 1
+        else:
+            slot = int(np.argmin(bucket.last_used))
+        self._clock += 1
+        bucket.vectors[slot] = embedding
+        bucket.responses[slot] = response
+        bucket.last_used[slot] = self._clock
+
+
+def unit_vector(values: List[float]) -> np.ndarray:
+    """float32 copy of an embedding scaled to unit length, so a dot product is cosine similarity"""
+    vector = np.asarray(values, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
@@ -20,23 +20,25 @@ class TutorService:
     """AI Tutor Service for personalized IELTS tutoring"""
     
     def __init__(self):
+        self.http_client: Optional[httpx.AsyncClient] = None
         self.openai_client = None
         self.anthropic_client = None
         self.active_sessions: Dict[str, TutorSession] = {}
         self.user_contexts: Dict[str, Dict[str, Any]] = {}
         
-    async def initialize(self):
+    async def initialize(self, http_client: Optional[httpx.AsyncClient] = None):
         """Initialize the tutor service"""
         logger.info("Initializing AI Tutor Service")
+        self.http_client = http_client or httpx.AsyncClient()
         
         # Initialize OpenAI client
         if settings.openai_api_key and settings.openai_api_key != "your-openai-api-key":
-            self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+            self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=self.http_client)
             logger.info("OpenAI client initialized")
         
         # Initialize Anthropic client
         if settings.anthropic_api_key and settings.anthropic_api_key != "your-anthropic-api-key":
-            self.anthropic_client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+            self.anthropic_client = AsyncAnthropic(api_key=settings.anthropic_api_key, http_client=self.http_client)
             logger.info("Anthropic client initialized")
         
         # Initialize user contexts
@@ -85,7 +87,7 @@ class TutorService:
             
             logger.info("Chat response generated", user_id=user_id, response_length=len(tutor_response.response))
             
-            return {
+            reply = {
                 "response": tutor_response.response,
                 "type": tutor_response.response_type,
                 "confidence": tutor_response.confidence,
@@ -94,6 +96,9 @@ class TutorService:
                 "learning_objectives": tutor_response.learning_objectives,
                 "session_id": self._get_session_id(user_id)
             }
+            if ai_response.get("fallback"):
+                reply["fallback"] = True
+            return reply
             
         except Exception as e:
             logger.error("Error in chat", user_id=user_id, error=str(e))
@@ -103,7 +108,8 @@ class TutorService:
                 "confidence": 0.5,
                 "suggestions": [],
                 "follow_up_questions": [],
-                "learning_objectives": []
+                "learning_objectives": [],
+                "fallback": True
             }
     
     async def get_personalized_feedback(self, user_id: str, module: str, performance_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -237,7 +243,7 @@ class TutorService:
                 
         except Exception as e:
             logger.error("Error generating AI response", error=str(e))
-            return self._generate_mock_response(context)
+            return {**self._generate_mock_response(context), "fallback": True}
     
     async def _generate_openai_response(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Generate response using OpenAI"""
@@ -362,14 +368,13 @@ Respond in a helpful, encouraging manner. Provide specific, actionable advice. A
     async def _get_user_progress(self, user_id: str) -> Optional[UserProgress]:
         """Get user progress from external service"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.api_service_url}/api/v1/users/{user_id}/progress",
-                    timeout=5.0
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return UserProgress(**data)
+            response = await self.http_client.get(
+                f"{settings.api_service_url}/api/v1/users/{user_id}/progress",
+                timeout=5.0
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return UserProgress(**data)
         except Exception as e:
             logger.warning("Could not fetch user progress", user_id=user_id, error=str(e))
         
@@ -378,14 +383,13 @@ Respond in a helpful, encouraging manner. Provide specific, actionable advice. A
     async def _get_learning_analytics(self, user_id: str) -> Optional[LearningAnalytics]:
         """Get learning analytics from external service"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.analytics_service_url}/api/v1/analytics/{user_id}",
-                    timeout=5.0
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return LearningAnalytics(**data)
+            response = await self.http_client.get(
+                f"{settings.analytics_service_url}/api/v1/analytics/{user_id}",
+                timeout=5.0
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return LearningAnalytics(**data)
         except Exception as e:
             logger.warning("Could not fetch learning analytics", user_id=user_id, error=str(e))
         
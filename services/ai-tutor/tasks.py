@@ -0,0 +1,140 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import orjson
+import structlog
+from celery import Celery
+from celery.schedules import crontab
+from redis import Redis
+
+from config import settings
+from services.learning_path_service import LearningPathService
+from services.recommendation_service import RecommendationService, is_complete_daily
+
+logger = structlog.get_logger()
+
+# Redis pub/sub channel the API process relays to WebSocket clients
+LEARNING_PATH_CHANNEL = "ai-tutor:learning-paths"
+
+# Sorted set of user_id -> last time their daily recommendations were read
+ACTIVE_USERS_KEY = "ai-tutor:active-users"
+# Users idle for longer than this are skipped by the nightly precompute (seconds)
+ACTIVE_USER_WINDOW = 7 * 24 * 3600
+# Precomputed daily recommendations outlive one refresh cycle (seconds)
+DAILY_RECOMMENDATIONS_TTL = 30 * 3600
+# Redis writes buffered per pipeline round trip
+PRECOMPUTE_BATCH_SIZE = 500
+
+def daily_recommendations_key(user_id: str) -> str:
+    return f"v1:daily:user:{user_id}"
+
+celery_app = Celery(
+    "ai-tutor",
+    broker=settings.celery_broker_url,
+    backend=settings.celery_result_backend
+)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    result_expires=3600,
+    task_track_started=True,
+    timezone="UTC",
+    enable_utc=True,
+    beat_schedule={
+        "precompute-daily-recommendations": {
+            "task": "ai_tutor.precompute_daily_recommendations",
+            "schedule": crontab(hour=0, minute=5)
+        }
+    }
+)
+
+# Per worker process; created on first use
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_learning_path_service: Optional[LearningPathService] = None
+_recommendation_service: Optional[RecommendationService] = None
+_redis: Optional[Redis] = None
+
+def _run(coro):
+    """Run a service coroutine on this worker process's event loop"""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+def _get_redis() -> Redis:
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(settings.redis_url)
+    return _redis
+
+def _get_learning_path_service() -> LearningPathService:
+    global _learning_path_service
+    if _learning_path_service is None:
+        _learning_path_service = LearningPathService()
+        _run(_learning_path_service.initialize())
+    return _learning_path_service
+
+def _get_recommendation_service() -> RecommendationService:
+    global _recommendation_service
+    if _recommendation_service is None:
+        _recommendation_service = RecommendationService()
+        _run(_recommendation_service.initialize())
+    return _recommendation_service
+
+def _publish(user_id: str, task_id: str, learning_path: Dict[str, Any]):
+    """Notify the API process so it can push the result over the user's WebSocket"""
+    try:
+        _get_redis().publish(LEARNING_PATH_CHANNEL, orjson.dumps({
+            "user_id": user_id,
+            "task_id": task_id,
+            "learning_path": learning_path
+        }))
+    except Exception as e:
+        logger.warning("Failed to publish learning path", user_id=user_id, task_id=task_id, error=str(e))
+
+@celery_app.task(bind=True, name="ai_tutor.generate_learning_path")
+def generate_learning_path_task(self, user_id: str, target_score: float, timeframe: str = "30") -> Dict[str, Any]:
+    """Generate a learning path outside the HTTP request"""
+    logger.info("Learning path task started", task_id=self.request.id, user_id=user_id)
+    
+    service = _get_learning_path_service()
+    learning_path = _run(service.generate_path(user_id, target_score, timeframe))
+    # Round-trip through orjson so datetimes are JSON-safe for the result backend
+    learning_path = orjson.loads(orjson.dumps(learning_path))
+    
+    _publish(user_id, self.request.id, learning_path)
+    logger.info("Learning path task completed", task_id=self.request.id, user_id=user_id)
+    return learning_path
+
+@celery_app.task(bind=True, name="ai_tutor.precompute_daily_recommendations")
+def precompute_daily_recommendations_task(self) -> Dict[str, Any]:
+    """Refresh daily recommendations for every recently active user"""
+    redis = _get_redis()
+    service = _get_recommendation_service()
+    
+    redis.zremrangebyscore(ACTIVE_USERS_KEY, "-inf", time.time() - ACTIVE_USER_WINDOW)
+    user_ids = [user_id.decode() for user_id in redis.zrange(ACTIVE_USERS_KEY, 0, -1)]
+    logger.info("Precomputing daily recommendations", task_id=self.request.id, users=len(user_ids))
+    
+    failed = 0
+    pipe = redis.pipeline(transaction=False)
+    for i, user_id in enumerate(user_ids, 1):
+        try:
+            recommendations = _run(service.get_daily_recommendations(user_id))
+            if is_complete_daily(recommendations):
+                pipe.set(daily_recommendations_key(user_id), orjson.dumps(recommendations), ex=DAILY_RECOMMENDATIONS_TTL)
+            else:
+                # Leave the key alone; the endpoint recomputes on its next miss
+                failed += 1
+                logger.warning("Daily recommendations fell back, not caching", user_id=user_id)
+        except Exception as e:
+            failed += 1
+            logger.error("Failed to precompute daily recommendations", user_id=user_id, error=str(e))
+        if i % PRECOMPUTE_BATCH_SIZE == 0:
+            pipe.execute()
+    pipe.execute()
+    
+    logger.info("Daily recommendations precomputed", task_id=self.request.id, users=len(user_ids), failed=failed)
+    return {"users": len(user_ids), "failed": failed}
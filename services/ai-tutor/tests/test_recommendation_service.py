@@ -0,0 +1,42 @@
+import asyncio
+from types import SimpleNamespace
+
+from services.recommendation_service import RecommendationService
+
+
+def _content(content_id: str, title: str, module: str, content_type: str, difficulty: str):
+    return {
+        "id": content_id,
+        "title": title,
+        "description": title,
+        "type": content_type,
+        "difficulty": difficulty,
+        "duration": 30,
+        "module": module
+    }
+
+
+def test_weak_area_item_survives_truncation():
+    service = RecommendationService()
+    service.content_database = {
+        "general": [
+            # Priority 2 (practice) and scored 0.7 for matching the current level
+            _content("read_1", "Reading practice A", "reading", "practice", "intermediate"),
+            _content("read_2", "Reading practice B", "reading", "practice", "intermediate"),
+            # Priority 1 (weak area), scored 0.8
+            _content("write_1", "Writing lesson", "writing", "lesson", "advanced"),
+        ]
+    }
+    service._build_content_index()
+    progress = SimpleNamespace(
+        weak_areas=["writing"],
+        current_level="intermediate",
+        target_level="upper_intermediate"
+    )
+
+    recommendations = asyncio.run(
+        service._generate_recommendations("user_1", progress, None, "general", limit=2)
+    )
+
+    assert [rec.title for rec in recommendations] == ["Writing lesson", "Reading practice A"]
+    assert [rec.priority for rec in recommendations] == [1, 2]
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+from api.websocket import COALESCE_WINDOW, EnhancedWebSocketManager, UserState
+
+
+class FakeWebSocket:
+    """Records sent frames; the first ``failures`` sends raise"""
+
+    def __init__(self, failures: int = 0):
+        self.sent = []
+        self.failures = failures
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("socket closed")
+        self.sent.append(json.loads(text))
+
+    async def close(self):
+        pass
+
+
+def _drain(queue: asyncio.Queue):
+    frames = []
+    while not queue.empty():
+        frames.append(json.loads(queue.get_nowait()[1]))
+    return frames
+
+
+def test_burst_is_sent_as_one_batch_frame():
+    async def scenario():
+        manager = EnhancedWebSocketManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, "user_1")
+        for i in range(3):
+            await manager.send_message("user_1", {"type": "note", "data": {"n": i}})
+        await asyncio.sleep(0.01)
+        manager.disconnect("user_1")
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+
+    assert len(sent) == 1
+    assert sent[0]["type"] == "batch"
+    assert [item["type"] for item in sent[0]["items"]] == [
+        "connection_established", "note", "note", "note"
+    ]
+    assert [item["data"]["n"] for item in sent[0]["items"][1:]] == [0, 1, 2]
+
+
+def test_only_last_audio_level_survives_coalescing():
+    async def scenario():
+        manager = EnhancedWebSocketManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, "user_1")
+        await asyncio.sleep(0.01)  # welcome frame goes out on its own
+        for level in (0.1, 0.2, 0.3):
+            await manager.send_message("user_1", {"type": "audio_level", "data": {"level": level}})
+        await asyncio.sleep(COALESCE_WINDOW * 5)
+        manager.disconnect("user_1")
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+
+    assert [frame["type"] for frame in sent] == ["connection_established", "audio_level"]
+    assert sent[1]["data"]["level"] == 0.3
+
+
+def test_shed_keeps_real_frames_and_warns_once():
+    async def scenario():
+        manager = EnhancedWebSocketManager()
+        state = await manager.connect(FakeWebSocket(), "user_1")
+        # Stop the writer so the queue backs up like a stalled client
+        manager._cancel_writer(state)
+        await asyncio.sleep(0)
+        for i in range(100):
+            await manager.send_message("user_1", {"type": "note", "data": {"n": i}})
+            await manager.send_message("user_1", {"type": "audio_level", "data": {"level": i}})
+        return _drain(state.queue)
+
+    frames = asyncio.run(scenario())
+    types = [frame["type"] for frame in frames]
+
+    assert types[0] == "connection_established"
+    assert [frame["data"]["n"] for frame in frames if frame["type"] == "note"] == list(range(100))
+    assert types.count("slow_client") == 1
+    assert types.count("audio_level") < 100
+    assert frames[-1] == {"type": "audio_level", "data": {"level": 99}}
+
+
+def test_double_send_failure_disconnects_without_removing_newer_connection():
+    async def scenario():
+        manager = EnhancedWebSocketManager()
+        calls = []
+        disconnect = manager.disconnect
+
+        def recording_disconnect(user_id, state=None):
+            calls.append((user_id, state))
+            disconnect(user_id, state)
+
+        manager.disconnect = recording_disconnect
+        failing = await manager.connect(FakeWebSocket(failures=2), "user_1")
+        await asyncio.sleep(0)  # first send fails, writer waits to retry
+        newer = UserState(websocket=FakeWebSocket(), queue=asyncio.Queue(), context={})
+        manager.users["user_1"] = newer
+        await failing.writer
+        return manager, calls, failing, newer
+
+    manager, calls, failing, newer = asyncio.run(scenario())
+
+    assert calls == [("user_1", failing)]
+    assert manager.users["user_1"] is newer
@@ -0,0 +1,18 @@
+import time
+
+# [whole second, formatted "YYYY-MM-DDTHH:MM:SS"] for iso_utc
+_TS_CACHE = [-1, ""]
+
+
+def iso_utc(t: float) -> str:
+    """UTC epoch seconds in ISO 8601, re-formatting the date part only when the second changes"""
+    sec = int(t)
+    if sec != _TS_CACHE[0]:
+        _TS_CACHE[0] = sec
+        _TS_CACHE[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+    return f"{_TS_CACHE[1]}.{int((t - sec) * 1e6):06d}Z"
+
+
+def iso_utc_now() -> str:
+    """Current UTC time in ISO 8601"""
+    return iso_utc(time.time())
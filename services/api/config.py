@@ -41,6 +41,11 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = Field(default="sqlite:///./ielts_dev.db", env="DATABASE_URL")
+    db_pool_size: int = Field(default=20, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, env="DB_MAX_OVERFLOW")
+    db_pool_timeout: int = Field(default=30, env="DB_POOL_TIMEOUT")
+    # Set when Postgres sits behind PgBouncer (pool_mode=transaction) so connections aren't pooled twice
+    db_external_pooler: bool = Field(default=False, env="DB_EXTERNAL_POOLER")
     
     # Redis
     redis_url: str = Field(default="redis://localhost:6379", env="REDIS_URL")
@@ -2,7 +2,7 @@
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 import structlog
 
 from services.api.config import settings
@@ -10,14 +10,28 @@ from services.api.models.base import Base
 
 logger = structlog.get_logger(__name__)
 
+
+def _pool_options() -> dict:
+    """Connection pool settings for the configured database."""
+    if "sqlite" in settings.database_url:
+        # Use StaticPool for SQLite in development
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    if settings.db_external_pooler:
+        # PgBouncer owns the pool; hand connections straight back to it
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+    }
+
+
 # Create database engine
 engine = create_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    # Use StaticPool for SQLite in development
-    poolclass=StaticPool if "sqlite" in settings.database_url else None,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
+    **_pool_options(),
 )
 
 # Create session factory